@@ -1,31 +1,64 @@
+import time
+_PROCESS_START = time.perf_counter()  # Referência para medir a inicialização
+
 import tkinter as tk
-from tkinter import Canvas, Toplevel, Text, Scrollbar, Frame, Button, Label, Entry
-from PIL import ImageGrab, Image, ImageTk, ImageFilter
-import numpy as np
-import cv2
-import easyocr
-from deep_translator import GoogleTranslator
+from tkinter import Canvas, Toplevel, Text, Scrollbar, Frame, Button, Label, Entry, simpledialog
 import keyboard
+import queue
 import threading
-import warnings
-import math
+import os
+from engine import TranslationEngine
+from frame_diff import FrameDiffer, grow_areas, rects_overlap
+from ocr_backends import BACKENDS
+from renderer import OverlayRenderer
+from metrics import ScanMetrics
+from multilang_ocr import translation_code
+from zones import WatchZone, ZoneScheduler, load_zones, save_zones
 
-# Suprime avisos específicos do torch
-warnings.filterwarnings("ignore", message=".*'pin_memory'.*")
+# Imports pesados (easyocr, cv2, deep_translator) são feitos em segundo plano
+_IMPORTS_DONE = time.perf_counter()
 
 
 class OCRTranslateOverlay:
     def __init__(self):
-        # Inicializa o leitor EasyOCR para inglês
-        self.ocr_reader = easyocr.Reader(['en'], gpu=False)
-        # Inicializa o tradutor Deep Translator (GoogleTranslator via deep-translator)
-        self.translator = GoogleTranslator(source='en', target='pt')
+        # Tempos (em segundos) de cada etapa da inicialização
+        self.startup_times = {'imports': _IMPORTS_DONE - _PROCESS_START}
+
+        # Núcleo sem interface (OCR, tradução, captura e métricas); o modelo de
+        # OCR e o tradutor carregam em segundo plano enquanto a HUD já aparece
+        self.engine = TranslationEngine()
+        self.config = self.engine.config
+        self.metrics = self.engine.metrics
 
-        # Lista para armazenar dados das regiões detectadas
+        # Lista para armazenar dados das regiões detectadas (só o mainloop a altera)
         self.regions = []
         self.hud_visible = True  # Estado inicial da HUD
 
+        # As threads de trabalho nunca tocam no Tk: pedem as atualizações por
+        # esta fila, que o mainloop esvazia em lotes (_drain_ui_queue). Cada
+        # scan leva a geração em que começou; resultados de gerações
+        # anteriores (scan substituído ou overlays limpos) são descartados.
+        self._ui_queue = queue.Queue()
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self.font_size = 12  # Tamanho da fonte dos overlays (lido fora do mainloop)
+
+        # Modo contínuo: captura periódica processando só o que mudou
+        self.live_mode = False
+        self.live_interval = 0.5  # Segundos entre capturas
+        self.frame_differ = FrameDiffer()
+        self._live_bbox = None
+        self._live_settle = False
+        self._live_thread = None  # Laço atual (só ele continua rodando)
+        self._overlay_excluded = False
+
+        # Zonas vigiadas (~/.ghosttext/zones.json), cada uma no seu intervalo
+        self.zones = load_zones()
+        self.zone_scheduler = None
+        self._stopped_zones = None  # Vigilância anterior (a nova espera a thread dela)
+
         # Cria janela principal (HUD)
+        started = time.perf_counter()
         self.root = tk.Tk()
         self.root.attributes('-fullscreen', True)
         self.root.attributes('-topmost', True)
@@ -33,10 +66,13 @@ class OCRTranslateOverlay:
         self.root.config(bg='black')
         # Define a cor preta como transparente
         self.root.attributes('-transparentcolor', 'black')
+        self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
 
         # Cria Canvas para desenhar borda e sobreposições
         self.canvas = Canvas(self.root, bg='black', highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        # Cada região vira uma única imagem (blur + texto com contorno)
+        self.renderer = OverlayRenderer(self.canvas)
 
         # Borda ao redor da tela (inicialmente vermelha)
         self.border_width = 3
@@ -60,6 +96,32 @@ class OCRTranslateOverlay:
                                    bg='gray20', fg='white', bd=0, padx=10, pady=5)
         btn_toggle_border.pack(side=tk.LEFT, padx=5)
 
+        btn_live = Button(self.controls, text="Modo Contínuo", command=self.toggle_live_mode,
+                          bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        btn_live.pack(side=tk.LEFT, padx=5)
+
+        btn_zones = Button(self.controls, text="Zonas", command=self.toggle_zone_watch,
+                           bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        btn_zones.pack(side=tk.LEFT, padx=5)
+
+        btn_save_zone = Button(self.controls, text="Salvar Zona", command=self.save_selection_as_zone,
+                               bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        btn_save_zone.pack(side=tk.LEFT, padx=5)
+
+        self.btn_ocr_backend = Button(self.controls, text=f"OCR: {self.engine.ocr_backend}",
+                                      command=self.cycle_ocr_backend,
+                                      bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        self.btn_ocr_backend.pack(side=tk.LEFT, padx=5)
+
+        self.btn_language = Button(self.controls, text=f"Idioma: {self.engine.source_lang}",
+                                   command=self.cycle_language,
+                                   bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        self.btn_language.pack(side=tk.LEFT, padx=5)
+
+        btn_metrics = Button(self.controls, text="Métricas", command=self.toggle_metrics,
+                             bg='gray20', fg='white', bd=0, padx=10, pady=5)
+        btn_metrics.pack(side=tk.LEFT, padx=5)
+
         btn_toggle_hud = Button(self.controls, text="Esconder HUD", command=self.toggle_hud,
                                 bg='gray20', fg='white', bd=0, padx=10, pady=5)
         btn_toggle_hud.pack(side=tk.LEFT, padx=5)
@@ -68,6 +130,13 @@ class OCRTranslateOverlay:
                           bg='gray20', fg='white', bd=0, padx=10, pady=5)
         btn_exit.pack(side=tk.LEFT, padx=5)
 
+        # Leitura dos tempos do último scan (canto superior esquerdo)
+        self.metrics_label = Label(self.root, bg='gray20', fg='white', justify=tk.LEFT,
+                                   font=('Consolas', 9), text="Nenhum scan ainda")
+        self.metrics_visible = False
+        if self.config['show_metrics']:
+            self.toggle_metrics()
+
         # Janela de textos
         self.text_window = None
         self.font_size_var = tk.StringVar(
@@ -81,15 +150,134 @@ class OCRTranslateOverlay:
         self.selection_bbox = None
         self.selection_window = None
 
+        self.startup_times['window'] = time.perf_counter() - started
+
         # Configura atalhos de teclado
+        started = time.perf_counter()
+        # (o keyboard chama os atalhos na thread dele: as ações de interface
+        # vão pela fila do mainloop)
+        keyboard.add_hotkey(
+            'ctrl+e', lambda: threading.Thread(
+                target=self.scan_and_overlay, name='scan', daemon=True).start())
         keyboard.add_hotkey(
-            'ctrl+e', lambda: threading.Thread(target=self.scan_and_overlay).start())
+            'ctrl+q', lambda: self._post(self.clear_overlays))
         keyboard.add_hotkey(
-            'ctrl+q', lambda: threading.Thread(target=self.clear_overlays).start())
+            'ctrl+shift+e', lambda: self._post(self.start_area_selection))
         keyboard.add_hotkey(
-            'ctrl+shift+e', self.start_area_selection)
+            'ctrl+h', lambda: self._post(self.toggle_hud))
         keyboard.add_hotkey(
-            'ctrl+h', self.toggle_hud)
+            'ctrl+l', lambda: self._post(self.toggle_live_mode))
+        keyboard.add_hotkey(
+            'ctrl+shift+l', lambda: self._post(self.toggle_zone_watch))
+        self.startup_times['hotkeys'] = time.perf_counter() - started
+
+        # Borda laranja enquanto o modelo de OCR e o tradutor carregam
+        self._change_border_color('orange')
+        self.root.after(100, self._check_ready)
+        self.root.after(15, self._drain_ui_queue)
+
+    def _post(self, func, *args, wait=False):
+        """
+        Agenda func(*args) no mainloop, a única thread que pode usar o Tk.
+        Com wait=True espera a execução e retorna o resultado (None se o
+        mainloop não responder a tempo). No próprio mainloop, executa direto.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return func(*args)
+        done = threading.Event() if wait else None
+        result = []
+        self._ui_queue.put((func, args, done, result))
+        if done is not None and done.wait(timeout=5):
+            return result[0] if result else None
+        return None
+
+    def _drain_ui_queue(self):
+        """Executa os pedidos das threads de trabalho, em lotes de até ~20 ms."""
+        deadline = time.perf_counter() + 0.02
+        while time.perf_counter() < deadline:
+            try:
+                func, args, done, result = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result.append(func(*args))
+            except Exception as e:
+                self.metrics.error("na interface", e)
+            finally:
+                if done is not None:
+                    done.set()
+        self.root.after(15, self._drain_ui_queue)
+
+    def _new_generation(self):
+        """Invalida os scans em andamento (seus resultados serão descartados)."""
+        with self._generation_lock:
+            self._generation += 1
+            return self._generation
+
+    def _check_ready(self):
+        """Acompanha o carregamento (no mainloop) e restaura a borda ao terminar."""
+        if not self.engine.is_loaded():
+            self.root.after(100, self._check_ready)
+            return
+
+        self.startup_times.update(self.engine.startup_times)
+        for stage, seconds in self.engine.ocr_engine.load_times.items():
+            self.startup_times['ocr_' + stage] = seconds
+        self.startup_times['total_until_ready'] = time.perf_counter() - _PROCESS_START
+
+        if self.border_color == 'orange':
+            # Borda cinza indica que o OCR ou o tradutor não puderam ser carregados
+            self._change_border_color('gray' if self.engine.failed else 'red')
+        self._overlay_excluded = self._exclude_overlay_from_capture()
+        self._print_startup_times()
+
+    def _print_startup_times(self):
+        """Mostra no console quanto tempo cada etapa da inicialização levou."""
+        print("Tempo de inicialização:")
+        for stage, seconds in self.startup_times.items():
+            print(f"  {stage:<22} {seconds * 1000:9.1f} ms")
+
+    def cycle_ocr_backend(self):
+        """Troca para o próximo motor de OCR disponível (ver ocr_backends)."""
+        names = list(BACKENDS)
+        current = self.engine.ocr_backend
+        index = names.index(current) if current in names else -1
+        self.switch_ocr_backend(names[(index + 1) % len(names)])
+
+    def switch_ocr_backend(self, name):
+        """Carrega outro motor de OCR em um novo processo, sem reiniciar o programa."""
+        if name == self.engine.ocr_backend:
+            return
+        ocr_engine = self.engine.switch_ocr_backend(name)
+        self.btn_ocr_backend.config(text=f"OCR: {name}")
+        self._change_border_color('orange')
+
+        def finish_switch():
+            ocr_engine.ready.wait()
+            if ocr_engine.error:
+                self._post(self._change_border_color, 'gray')
+                return
+            times = ', '.join(f"{stage} {seconds * 1000:.0f} ms"
+                              for stage, seconds in ocr_engine.load_times.items())
+            print(f"Motor de OCR '{name}' carregado ({times})")
+            self._post(self._change_border_color, 'red')
+
+        threading.Thread(target=finish_switch, daemon=True).start()
+
+    def cycle_language(self):
+        """
+        Troca o idioma de origem entre 'auto' e os auto_languages, sem
+        reiniciar: os leitores de OCR e tradutores já usados continuam
+        carregados (o primeiro uso de um idioma novo carrega o modelo dele).
+        """
+        choices = ['auto'] + [translation_code(lang) for lang in self.config['auto_languages']]
+        if self.config['source_lang'] not in choices:
+            choices.append(self.config['source_lang'])
+        current = self.engine.source_lang
+        index = choices.index(current) if current in choices else -1
+        language = choices[(index + 1) % len(choices)]
+        self.engine.set_language(language)
+        self.btn_language.config(text=f"Idioma: {language}")
 
     def _create_border(self):
         """Desenha a borda ao redor da tela."""
@@ -150,60 +338,40 @@ class OCRTranslateOverlay:
             self.controls.place(relx=0.5, rely=0.95, anchor='center')
         else:
             self.controls.place_forget()
+        self._place_metrics_label()
+
+    def toggle_metrics(self):
+        """Mostra/esconde a leitura dos tempos do último scan na HUD."""
+        self.metrics_visible = not self.metrics_visible
+        self._place_metrics_label()
+
+    def _place_metrics_label(self):
+        if self.metrics_visible and self.hud_visible:
+            self.metrics_label.place(relx=0.01, rely=0.02, anchor='nw')
+        else:
+            self.metrics_label.place_forget()
+
+    def _report_metrics(self, metrics):
+        """Registra o scan concluído e atualiza a leitura na HUD (no mainloop)."""
+        self.metrics.emit(metrics)
+        if self.metrics_visible:
+            self.metrics_label.config(text=metrics.summary())
 
     def _take_screenshot(self, bbox=None):
-        """Captura a tela ou uma área específica."""
+        """
+        Captura a tela ou uma área específica como array RGB (NumPy). O array
+        pode vir do pool de buffers da captura, que o reaproveita quando ele
+        deixa de ser usado.
+        """
         if bbox:
             # Verifica se a área de seleção é válida
             x1, y1, x2, y2 = bbox
             if abs(x2 - x1) < 10 or abs(y2 - y1) < 10:
                 return None
-            return ImageGrab.grab(bbox=bbox)
-        else:
-            width = self.root.winfo_screenwidth()
-            height = self.root.winfo_screenheight()
-            return ImageGrab.grab(bbox=(0, 0, width, height))
-
-    def _get_brightness(self, rgb):
-        """Calcula o brilho de uma cor RGB (0-255)."""
-        r, g, b = rgb
-        return math.sqrt(0.299 * r**2 + 0.587 * g**2 + 0.114 * b**2)
-
-    def _approximate_text_color(self, img_region):
-        """
-        Aproxima a cor do texto original extraindo pixels escuros do centro da região.
-        Retorna a cor do texto e a cor do contorno apropriada.
-        """
-        np_img = np.array(img_region.convert('RGB'))
-        h, w, _ = np_img.shape
-
-        # Recorta uma área central
-        x1 = int(w * 0.4)
-        y1 = int(h * 0.4)
-        x2 = int(w * 0.6)
-        y2 = int(h * 0.6)
-        central = np_img[y1:y2, x1:x2, :]
-
-        # Converte para escala de cinza para encontrar pixels escuros
-        gray = cv2.cvtColor(central, cv2.COLOR_RGB2GRAY)
-        mask = gray < 128
-
-        if np.count_nonzero(mask) == 0:
-            # Se não houver pixels escuros, usamos preto
-            text_color = '#000000'
-            avg_color = (0, 0, 0)
+            return self.engine.grab(bbox)
         else:
-            selected = central[mask]
-            avg_color = np.mean(selected, axis=0).astype(int)
-            text_color = '#{:02x}{:02x}{:02x}'.format(
-                avg_color[0], avg_color[1], avg_color[2])
-
-        # Determina se precisamos de contorno claro ou escuro
-        brightness = self._get_brightness(avg_color)
-        outline_color = '#ffffff' if brightness < 127 else '#000000'
-
-        # Garantir que retorna apenas 2 valores
-        return (text_color, outline_color)
+            width, height = self.screen_size
+            return self.engine.grab((0, 0, width, height))
 
     def start_area_selection(self):
         """Inicia o modo de seleção de área com o mouse."""
@@ -237,7 +405,7 @@ class OCRTranslateOverlay:
         self.selection_canvas.bind("<ButtonRelease-1>", self.on_selection_end)
 
         # Configura atalho para confirmar com Enter
-        keyboard.add_hotkey('enter', self.confirm_selection)
+        keyboard.add_hotkey('enter', lambda: self._post(self.confirm_selection))
 
     def on_selection_start(self, event):
         """Inicia a seleção de área."""
@@ -277,7 +445,7 @@ class OCRTranslateOverlay:
             keyboard.remove_hotkey('enter')
 
             # Processa a área selecionada
-            threading.Thread(target=self.scan_and_overlay,
+            threading.Thread(target=self.scan_and_overlay, name='scan', daemon=True,
                              args=(self.selection_bbox,)).start()
         elif self.selecting_area:
             # Se não houver seleção, apenas cancela
@@ -287,135 +455,295 @@ class OCRTranslateOverlay:
             keyboard.remove_hotkey('enter')
 
     def scan_and_overlay(self, bbox=None):
-        """Captura tela, executa OCR, traduz e aplica blur+texto traduzido."""
+        """
+        Captura tela, executa OCR, traduz e aplica blur+texto traduzido.
+        Roda fora do mainloop: a interface só é alterada via _post.
+        """
+        # Aguarda o carregamento em segundo plano, se ainda estiver em andamento
+        if not self.engine.wait_until_ready():
+            return
+
+        # Tira os overlays da captura (e invalida scans anteriores)
+        generation, previous = self._post(self._begin_scan, wait=True) or (None, [])
+
+        metrics = ScanMetrics('scan')
+        try:
+            with self.metrics.profile():
+                self._scan(bbox, metrics, generation, previous)
+        except Exception as e:
+            self.metrics.error("durante o processamento", e)
+        finally:
+            self._post(self._finish_scan, generation, metrics)
+
+    def _begin_scan(self):
+        """
+        Prepara a HUD para um scan (no mainloop). Retorna a geração do scan e
+        as regiões atuais, que o scan compara com as novas para redesenhar só
+        o que mudou.
+        """
         # Mostra HUD se estiver oculta
         if not self.hud_visible:
             self.toggle_hud()
 
         # Altera borda para verde durante processamento
         self._change_border_color('green')
+        if not self._overlay_excluded:
+            # Esconde os overlays (sem descartá-los) para não aparecerem na captura
+            self.renderer.hide_all()
+            self.root.update_idletasks()
+        return self._new_generation(), list(self.regions)
+
+    def _scan(self, bbox, metrics, generation, previous):
+        """Etapas de um scan (ver scan_and_overlay)."""
+        # Captura a tela (toda ou área específica)
+        with metrics.stage('capture'):
+            frame = self._take_screenshot(bbox)
+
+        # Verifica se a captura foi bem sucedida
+        if frame is None:
+            print("Erro: Área de seleção inválida!")
+            return
 
-        try:
-            # Limpa overlays anteriores e regiões
-            self.clear_overlays()
-
-            # Captura a tela (toda ou área específica)
-            screenshot = self._take_screenshot(bbox)
-
-            # Verifica se a captura foi bem sucedida
-            if screenshot is None:
-                print("Erro: Área de seleção inválida!")
-                return
+        # Executa OCR e tradução
+        # (a área capturada identifica o OCR incremental entre varreduras)
+        ocr_key = bbox if bbox else 'screen'
+        regions = self.engine.translate_frame(frame, bbox, ocr_key, metrics, previous=previous)
+        if regions is None:
+            metrics.count('superseded')
+            return  # Varredura substituída por uma mais recente da mesma área
+        if generation != self._generation:
+            metrics.count('stale')
+            return  # Overlays limpos ou novo scan iniciado enquanto processava
+
+        # Regiões do scan anterior que não aparecem mais
+        kept = {id(region) for region in regions}
+        removed = [region for region in previous if id(region) not in kept]
+
+        images = self._compose_changed(regions, metrics)
+        self._post(self._show_regions, generation, regions, images, removed, metrics)
+
+    def _compose_changed(self, regions, metrics):
+        """Monta (fora do mainloop) as imagens só das regiões novas ou alteradas."""
+        with metrics.stage('compose'):
+            images = [self.renderer.compose(region, self.font_size)
+                      if self.renderer.needs_draw(region, self.font_size) else None
+                      for region in regions]
+        metrics.count('regions_drawn', sum(image is not None for image in images))
+        return images
+
+    def _show_regions(self, generation, regions, images, removed, metrics):
+        """Exibe (no mainloop) o resultado de um scan, se ele ainda for atual."""
+        if generation != self._generation:
+            metrics.count('stale')
+            return
 
-            # Executa OCR com EasyOCR - detecta blocos de texto completos
-            ocr_results = self.ocr_reader.readtext(
-                np.array(screenshot), detail=1, paragraph=True)
-
-            # Determinar offset (se for uma área recortada)
-            x_offset = bbox[0] if bbox else 0
-            y_offset = bbox[1] if bbox else 0
-
-            # Coleta todos os textos primeiro
-            all_texts = []
-            regions_data = []
-            for res in ocr_results:
-                # Versão mais recente do EasyOCR retorna (bbox, text) ou (bbox, text, confidence)
-                if len(res) == 3:
-                    bbox_pts, orig_text, confidence = res
-                elif len(res) == 2:
-                    bbox_pts, orig_text = res
-                    confidence = 1.0  # Assume confiança máxima
-                else:
-                    continue
-
-                if confidence < 0.5 or orig_text.strip() == '':
-                    continue
-
-                xs = [int(pt[0]) for pt in bbox_pts]
-                ys = [int(pt[1]) for pt in bbox_pts]
-                x, y = min(xs), min(ys)
-                w, h = max(xs) - x, max(ys) - y
-
-                # Ajusta para coordenadas absolutas da tela
-                x_abs = x + x_offset
-                y_abs = y + y_offset
-
-                region = screenshot.crop((x, y, x + w, y + h))
-                text_color, outline_color = self._approximate_text_color(
-                    region)
-
-                all_texts.append(orig_text)
-                regions_data.append(
-                    (x_abs, y_abs, w, h, region, text_color, outline_color, orig_text))
-
-            # Traduz todos os textos de uma vez (blocos completos)
-            translations = []
-            for text in all_texts:
-                try:
-                    translations.append(self.translator.translate(text))
-                except Exception as e:
-                    print(f"Erro na tradução: {e}")
-                    translations.append(text)
-
-            # Aplica blur e texto traduzido
-            for i, (translation, data) in enumerate(zip(translations, regions_data)):
-                x_abs, y_abs, w, h, region, text_color, outline_color, orig_text = data
-
-                # Aplica blur na região
-                blurred = region.filter(ImageFilter.GaussianBlur(radius=5))
-                blurred_tk = ImageTk.PhotoImage(blurred)
-
-                # Desenha blur no Canvas
-                blur_item = self.canvas.create_image(
-                    x_abs, y_abs, anchor=tk.NW, image=blurred_tk, tags="overlay")
-
-                # Desenha contorno para melhor legibilidade
-                for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1), (0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    self.canvas.create_text(
-                        x_abs + 2 + dx, y_abs + 2 + dy,
-                        anchor=tk.NW,
-                        text=translation,
-                        fill=outline_color,
-                        font=('Arial', int(self.font_size_var.get())),
-                        width=w-4,  # Limita a largura à área do texto original
-                        tags="overlay"
-                    )
-
-                # Desenha texto traduzido dentro da área original
-                text_item = self.canvas.create_text(
-                    x_abs + 2, y_abs + 2,
-                    anchor=tk.NW,
-                    text=translation,
-                    fill=text_color,
-                    font=('Arial', int(self.font_size_var.get())),
-                    width=w-4,  # Limita a largura à área do texto original
-                    tags="overlay"
-                )
-
-                # Armazena dados
-                self.regions.append({
-                    'bbox': (x_abs, y_abs, w, h),
-                    'orig_text': orig_text,
-                    'translation': translation,
-                    'text_color': text_color,
-                    'outline_color': outline_color,
-                    'blurred_pil': blurred,  # Armazena a imagem borrada (PIL)
-                    'blur_img': blurred_tk,
-                    'text_item': text_item
-                })
-
-            # Mantém referências às imagens
-            self.canvas.blur_images = [r['blur_img'] for r in self.regions]
+        with metrics.stage('draw'):
+            removed_ids = {id(region) for region in removed}
+            for region in self.regions:
+                if id(region) in removed_ids:
+                    self.renderer.remove(region)
+            self.regions[:] = [r for r in self.regions if id(r) not in removed_ids]
+
+            # Regiões mantidas do scan anterior já estão na tela
+            present = {id(region) for region in self.regions}
+            for region, image in zip(regions, images):
+                self.renderer.draw(region, self.font_size, image)
+                if id(region) not in present:
+                    self.regions.append(region)
+            self.renderer.show_all()
 
             # Atualiza janela de textos se estiver aberta
             if self.text_window and tk.Toplevel.winfo_exists(self.text_window):
                 self.update_text_window()
 
+    def _finish_scan(self, generation, metrics):
+        """Registra o scan e restaura a borda, se nenhum outro começou depois."""
+        self._report_metrics(metrics)
+        if generation == self._generation:
+            self.renderer.show_all()
+            self._change_border_color('cyan' if self.live_mode or self.zone_scheduler else 'red')
+
+    def _draw_region(self, region):
+        """Desenha (ou atualiza) o blur e o texto traduzido de uma região no Canvas."""
+        self.renderer.draw(region, self.font_size)
+
+    def toggle_live_mode(self):
+        """Liga/desliga o modo contínuo, que retraduz automaticamente o que mudar na tela."""
+        if self.live_mode:
+            self.live_mode = False
+            self._change_border_color('red')
+            return
+
+        self.live_mode = True
+        self._change_border_color('cyan')
+        # Desligar e religar dentro do intervalo não cria um segundo laço: o
+        # anterior vê que não é mais o atual e termina antes do novo começar
+        previous = self._live_thread
+        self._live_thread = threading.Thread(
+            target=self._live_loop, args=(previous,), name='live', daemon=True)
+        self._live_thread.start()
+
+    def _exclude_overlay_from_capture(self):
+        """
+        No Windows 10+, impede que a própria HUD apareça nas capturas de tela,
+        para que o modo contínuo não leia nem reaja aos próprios overlays.
+        """
+        if os.name != 'nt':
+            return False
+        try:
+            import ctypes
+            WDA_EXCLUDEFROMCAPTURE = 0x11
+            hwnd = ctypes.windll.user32.GetParent(self.root.winfo_id())
+            return bool(ctypes.windll.user32.SetWindowDisplayAffinity(
+                hwnd, WDA_EXCLUDEFROMCAPTURE))
         except Exception as e:
-            print(f"Erro durante o processamento: {e}")
+            print(f"Aviso: não foi possível excluir a HUD da captura: {e}")
+            return False
+
+    def _live_loop(self, previous=None):
+        """Captura a tela periodicamente e processa apenas as áreas alteradas."""
+        current = threading.current_thread()
+        if previous is not None:
+            previous.join()
+        if not self.engine.wait_until_ready():
+            if self._live_thread is current:
+                self.live_mode = False
+            return
+        self.frame_differ.reset()
+        self._live_bbox = None
+        self._live_settle = False
+        while self.live_mode and self._live_thread is current:
+            started = time.perf_counter()
+            try:
+                with self.metrics.profile():
+                    self._live_step()
+            except Exception as e:
+                self.metrics.error("no modo contínuo", e)
+            elapsed = time.perf_counter() - started
+            time.sleep(max(0.0, self.live_interval - elapsed))
+
+    def _live_step(self):
+        """Executa um ciclo do modo contínuo (fora do mainloop)."""
+        bbox = self.selection_bbox
+        if bbox != self._live_bbox:
+            # Área de captura mudou: recomeça do zero
+            self._live_bbox = bbox
+            self.frame_differ.reset()
+            self._post(self.clear_overlays, wait=True)
+        generation = self._generation
+
+        metrics = ScanMetrics('live')
+        with metrics.stage('capture'):
+            frame = self._take_screenshot(bbox)
+        if frame is None:
+            return
+
+        if self._live_settle:
+            # Os overlays recém-desenhados aparecem na captura: usa este quadro
+            # como referência para não reagir às próprias traduções
+            self._live_settle = False
+            self.frame_differ.commit(frame)
+            return
+
+        x_offset = bbox[0] if bbox else 0
+        y_offset = bbox[1] if bbox else 0
+
+        with metrics.stage('diff'):
+            areas = self.frame_differ.changed_areas(
+                frame, margin=self.frame_differ.tile_size // 2)
+        if not areas:
+            return  # Quadro igual ao último processado: nada a fazer
+        metrics.count('changed_areas', len(areas))
+
+        self._post(self._change_border_color, 'green')
+        try:
+            # Cópia: a lista de regiões pertence ao mainloop
+            current = list(self.regions)
+            # Caixas das regiões antigas nas coordenadas do quadro
+            boxes = [(rx - x_offset, ry - y_offset, rx - x_offset + rw, ry - y_offset + rh)
+                     for rx, ry, rw, rh in (r['bbox'] for r in current)]
+            # Inclui as regiões antigas que tocam cada área para não cortar
+            # textos; as áreas que passam a se sobrepor são unidas, então
+            # cada região antiga pertence a uma área só
+            areas = grow_areas(areas, boxes, frame.shape[1], frame.shape[0])
+            removed, regions, images = [], [], []
+            for x1, y1, x2, y2 in areas:
+                stale = [r for r, box in zip(current, boxes)
+                         if rects_overlap(box, (x1, y1, x2, y2))]
+                area = frame[y1:y2, x1:x2]
+                found = self.engine.translate_frame(
+                    area, (x1 + x_offset, y1 + y_offset), metrics=metrics, previous=stale) or []
+                # Regiões antigas que o novo OCR não manteve saem da tela
+                removed += [old for old in stale if all(old is not r for r in found)]
+                images += self._compose_changed(found, metrics)
+                regions += found
+
+            self._post(self._show_regions, generation, regions, images, removed, metrics)
         finally:
-            # Restaura cor da borda após processamento
+            self.frame_differ.commit(frame)
+            self._live_settle = not self._overlay_excluded
+            self._post(self._finish_scan, generation, metrics)
+
+    def toggle_zone_watch(self):
+        """Liga/desliga a vigilância das zonas salvas (ver zones.ZoneScheduler)."""
+        if self.zone_scheduler is not None:
+            self.zone_scheduler.stop()
+            self._stopped_zones, self.zone_scheduler = self.zone_scheduler, None
             self._change_border_color('red')
+            return
+
+        if not any(zone.enabled for zone in self.zones):
+            print("Nenhuma zona salva: selecione uma área (Ctrl+Shift+E) e use \"Salvar Zona\".")
+            return
+        # As regiões já na tela (de uma vigilância anterior) continuam
+        # acompanhadas: saem da tela quando o texto da zona mudar
+        self.zone_scheduler = ZoneScheduler(
+            self.engine, self.zones, self._zone_result,
+            begin=lambda zone: self._generation, settle=not self._overlay_excluded,
+            seed=lambda zones: self._post(self._regions_in_zones, zones, wait=True))
+        self.zone_scheduler.start(after=self._stopped_zones)
+        self._stopped_zones = None
+        self._change_border_color('cyan')
+
+    def _regions_in_zones(self, zones):
+        """Regiões na tela dentro de cada zona (na de maior prioridade, se houver várias)."""
+        shown = {zone.name: [] for zone in zones}
+        ordered = sorted(zones, key=lambda zone: -zone.priority)
+        for region in self.regions:
+            x, y, w, h = region['bbox']
+            for zone in ordered:
+                zx1, zy1, zx2, zy2 = zone.bbox
+                if zx1 <= x and zy1 <= y and x + w <= zx2 and y + h <= zy2:
+                    shown[zone.name].append(region)
+                    break
+        return shown
+
+    def _zone_result(self, zone, regions, removed, metrics, generation):
+        """Resultado de uma zona (na thread das zonas): monta e envia ao mainloop."""
+        if generation != self._generation:
+            metrics.count('stale')
+        else:
+            images = self._compose_changed(regions, metrics)
+            self._post(self._show_regions, generation, regions, images, removed, metrics)
+        self._post(self._finish_scan, generation, metrics)
+
+    def save_selection_as_zone(self):
+        """Salva a última área selecionada como zona vigiada (substitui a de mesmo nome)."""
+        if not self.selection_bbox:
+            print("Selecione uma área primeiro (Ctrl+Shift+E).")
+            return
+        name = simpledialog.askstring("Salvar Zona", "Nome da zona (ex.: legendas, missões, chat):",
+                                      parent=self.root)
+        if not name:
+            return
+        self.zones = [zone for zone in self.zones if zone.name != name]
+        self.zones.append(WatchZone(name, self.selection_bbox, interval=self.live_interval))
+        save_zones(self.zones)
+
+        # Recomeça a vigilância com a zona nova
+        if self.zone_scheduler is not None:
+            self.toggle_zone_watch()
+            self.toggle_zone_watch()
 
     def clear_overlays(self):
         """Remove todos os itens de overlay do Canvas, mantendo os textos na janela."""
@@ -423,8 +751,11 @@ class OCRTranslateOverlay:
         if not self.hud_visible:
             self.toggle_hud()
 
-        self.canvas.delete("overlay")
+        self.renderer.clear()
         self.regions.clear()  # Limpa completamente a lista de regiões
+        self._new_generation()  # Descarta resultados de scans em andamento
+        if self.zone_scheduler is not None:
+            self.zone_scheduler.reset()  # As zonas são lidas e desenhadas de novo
 
         # Atualiza janela de textos sem fechá-la
         if self.text_window and tk.Toplevel.winfo_exists(self.text_window):
@@ -532,18 +863,25 @@ class OCRTranslateOverlay:
         # Atualiza traduções
         self.txt_translated.delete("1.0", tk.END)
 
-        for idx, orig in enumerate(edited_text):
-            if idx >= len(self.regions) or not orig.strip():
-                continue
-
-            try:
-                new_translation = self.translator.translate(orig)
-            except Exception as e:
-                print(f"Erro na retradução: {e}")
-                new_translation = orig
-
-            self.regions[idx]['translation'] = new_translation
+        # Retraduz todos os textos editados em um único lote (por idioma de origem)
+        pending = [(idx, orig) for idx, orig in enumerate(edited_text)
+                   if idx < len(self.regions) and orig.strip()]
+        texts = [orig for _, orig in pending]
+        metrics = ScanMetrics('retranslate')
+        translations = self.engine.translate_texts(
+            texts, metrics, [self.engine.source_for(text) for text in texts])
+        if metrics.counters.get('translation_failures'):
+            self.metrics.error("na retradução",
+                               f"{metrics.counters['translation_failures']} textos não traduzidos")
+
+        for (idx, orig), new_translation in zip(pending, translations):
+            region = self.regions[idx]
+            region['translation'] = new_translation
             self.txt_translated.insert(tk.END, new_translation + "\n\n")
+            # Texto corrigido pelo usuário: a próxima leitura igual do OCR
+            # já sai com esta tradução (memória de traduções)
+            if orig != region['orig_text']:
+                self.engine.remember(region['orig_text'], new_translation)
 
     def apply_texts(self):
         """Aplica os textos editados como overlay na tela (com blur)."""
@@ -551,50 +889,20 @@ class OCRTranslateOverlay:
         if not self.hud_visible:
             self.toggle_hud()
 
-        # Limpa overlays anteriores
-        self.canvas.delete("overlay")
-
-        # Aplica os textos atuais com blur
+        # Traduções editadas à mão na janela de textos valem para as regiões
+        # atuais e ficam na memória de traduções para os próximos scans
+        if self.text_window and tk.Toplevel.winfo_exists(self.text_window):
+            edited = self.txt_translated.get("1.0", tk.END).strip().split("\n\n")
+            if len(edited) == len(self.regions):
+                for region, translation in zip(self.regions, edited):
+                    translation = translation.strip()
+                    if translation and translation != region['translation']:
+                        region['translation'] = translation
+                        self.engine.remember(region['orig_text'], translation)
+
+        # Aplica os textos atuais com blur (regiões inalteradas não são redesenhadas)
         for region in self.regions:
-            x_abs, y_abs, w, h = region['bbox']
-            translation = region['translation']
-            text_color = region['text_color']
-            outline_color = region['outline_color']
-            blurred_pil = region['blurred_pil']
-
-            # Recria a imagem borrada
-            blurred_tk = ImageTk.PhotoImage(blurred_pil)
-
-            # Desenha blur no Canvas
-            blur_item = self.canvas.create_image(
-                x_abs, y_abs, anchor=tk.NW, image=blurred_tk, tags="overlay")
-
-            # Desenha contorno para melhor legibilidade
-            for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1), (0, 1), (0, -1), (1, 0), (-1, 0)]:
-                self.canvas.create_text(
-                    x_abs + 2 + dx, y_abs + 2 + dy,
-                    anchor=tk.NW,
-                    text=translation,
-                    fill=outline_color,
-                    font=('Arial', int(self.font_size_var.get())),
-                    width=w-4,
-                    tags="overlay"
-                )
-
-            # Desenha texto traduzido dentro da área original
-            text_item = self.canvas.create_text(
-                x_abs + 2, y_abs + 2,
-                anchor=tk.NW,
-                text=translation,
-                fill=text_color,
-                font=('Arial', int(self.font_size_var.get())),
-                width=w-4,
-                tags="overlay"
-            )
-
-            # Atualiza referências
-            region['blur_img'] = blurred_tk
-            region['text_item'] = text_item
+            self._draw_region(region)
 
     def apply_font_size(self):
         """Atualiza o tamanho da fonte para todos os overlays."""
@@ -603,6 +911,7 @@ class OCRTranslateOverlay:
             size = int(self.font_size_var.get())
             if size <= 0:
                 raise ValueError("Tamanho deve ser positivo")
+            self.font_size = size
 
             # Reaplica os overlays com novo tamanho
             self.apply_texts()
@@ -611,7 +920,11 @@ class OCRTranslateOverlay:
 
     def close_program(self):
         """Encerra o programa e limpa atalhos."""
+        self.live_mode = False
+        if self.zone_scheduler is not None:
+            self.zone_scheduler.stop()
         keyboard.clear_all_hotkeys()
+        self.engine.close()
         self.root.destroy()
 
     def run(self):
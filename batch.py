@@ -0,0 +1,238 @@
+"""
+Modo em lote: traduz pastas de capturas de tela e vídeos sem abrir a HUD.
+
+Uso:
+    python batch.py ENTRADA [ENTRADA ...] [--output resultados.jsonl]
+                    [--srt-dir legendas/] [--every 1] [--interval 0.5]
+                    [--workers 4]
+
+Cada ENTRADA pode ser uma imagem, uma pasta de imagens ou um vídeo. Os
+quadros são amostrados (--every, --interval), quadros repetidos são
+pulados e os demais passam pelo OCR (vários processos, --workers) e pela
+tradução. O resultado é gravado em JSONL (um quadro por linha, com as
+caixas) e, para vídeos, também como legendas SRT posicionadas.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from capture import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from config import load_config
+from engine import TranslationEngine
+from frame_diff import FrameDiffer
+from metrics import Metrics, ScanMetrics
+
+
+def iter_sources(paths):
+    """Expande as entradas em arquivos (pastas viram suas imagens e vídeos, em ordem)."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(IMAGE_EXTENSIONS + VIDEO_EXTENSIONS):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def iter_frames(path, every=1, interval=None):
+    """
+    Gera (índice, segundos, quadro RGB) de uma imagem ou vídeo. Em vídeos,
+    mantém um quadro a cada `every` ou a cada `interval` segundos; os quadros
+    pulados não são decodificados.
+    """
+    import cv2
+
+    if not path.lower().endswith(VIDEO_EXTENSIONS):
+        from PIL import Image
+        with Image.open(path) as image:
+            yield 0, None, np.asarray(image.convert('RGB'))
+        return
+
+    video = cv2.VideoCapture(path)
+    if not video.isOpened():
+        raise ValueError(f"Não foi possível abrir o vídeo: {path}")
+    fps = video.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, round(interval * fps)) if interval else max(1, every)
+    index = 0
+    try:
+        while video.grab():
+            if index % step == 0:
+                ok, frame = video.retrieve()
+                if not ok:
+                    break
+                yield index, index / fps, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            index += 1
+    finally:
+        video.release()
+
+
+def _srt_time(seconds):
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+class SRTWriter:
+    """
+    Legendas de um vídeo: cada texto vira uma legenda posicionada na caixa
+    onde apareceu ({\\an7\\pos(x,y)}), aberta enquanto o texto continuar na tela.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.count = 0
+        self._open = {}  # texto original -> (início, região)
+        self._last_time = 0.0
+
+    def update(self, seconds, regions):
+        """Registra os textos presentes no quadro do instante `seconds`."""
+        current = {region['orig_text']: region for region in regions}
+        for text in list(self._open):
+            if text not in current:
+                self._close(text, seconds)
+        for text, region in current.items():
+            self._open.setdefault(text, (seconds, region))
+        self._last_time = seconds
+
+    def _close(self, text, end):
+        start, region = self._open.pop(text)
+        x, y, _, _ = region['bbox']
+        self.count += 1
+        self.file.write(f"{self.count}\n{_srt_time(start)} --> {_srt_time(max(end, start + 0.5))}\n"
+                        f"{{\\an7\\pos({x},{y})}}{region['translation']}\n\n")
+
+    def close(self, end=None):
+        for text in list(self._open):
+            self._close(text, end if end is not None else self._last_time + 1.0)
+        self.file.close()
+
+
+def run_batch(engine, paths, output, srt_dir=None, every=1, interval=None, workers=1):
+    """
+    Processa as entradas e grava os resultados; retorna as estatísticas.
+    output é o caminho do JSONL, '-' (saída padrão) ou um arquivo já aberto.
+    """
+    stats = {'frames': 0, 'duplicates': 0, 'processed': 0, 'regions': 0, 'errors': 0}
+    pending = deque()
+    max_in_flight = 2 * workers
+
+    def process(frame):
+        metrics = ScanMetrics('batch')
+        regions = engine.translate_frame(frame, metrics=metrics, with_overlay=False)
+        engine.metrics.emit(metrics)
+        return regions or []
+
+    def flush(limit):
+        # Grava os resultados na ordem dos quadros, mantendo poucos em memória
+        while len(pending) > limit:
+            source, index, seconds, future, srt = pending.popleft()
+            try:
+                regions = future.result()
+            except Exception as e:
+                engine.metrics.error(f"em {source} (quadro {index})", e)
+                stats['errors'] += 1
+                continue
+            stats['processed'] += 1
+            stats['regions'] += len(regions)
+            out.write(json.dumps({
+                'source': source, 'frame': index, 'time': seconds,
+                'regions': [{'bbox': list(region['bbox']), 'text': region['orig_text'],
+                             'translation': region['translation']} for region in regions],
+            }, ensure_ascii=False) + '\n')
+            if srt is not None:
+                srt.update(seconds, regions)
+
+    if hasattr(output, 'write'):
+        out = output
+    else:
+        out = open(output, 'w', encoding='utf-8') if output != '-' else sys.stdout
+    differ, differ_key = None, None
+    try:
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='batch') as executor:
+            for source in iter_sources(paths):
+                # Imagens seguidas da mesma pasta (capturas de tela) são comparadas
+                # entre si; cada vídeo começa do zero
+                if source.lower().endswith(VIDEO_EXTENSIONS):
+                    key = source
+                else:
+                    key = ('images', os.path.dirname(os.path.abspath(source)))
+                if key != differ_key:
+                    differ, differ_key = FrameDiffer(), key
+                srt = None
+                if srt_dir and source.lower().endswith(VIDEO_EXTENSIONS):
+                    os.makedirs(srt_dir, exist_ok=True)
+                    name = os.path.splitext(os.path.basename(source))[0]
+                    srt = SRTWriter(os.path.join(srt_dir, name + '.srt'))
+                try:
+                    for index, seconds, frame in iter_frames(source, every, interval):
+                        stats['frames'] += 1
+                        # Quadro igual ao último traduzido (tela parada): pula
+                        if not differ.changed_tiles(frame).any():
+                            stats['duplicates'] += 1
+                            continue
+                        differ.commit(frame)
+                        pending.append((source, index, seconds,
+                                        executor.submit(process, frame), srt))
+                        flush(max_in_flight)
+                except Exception as e:
+                    engine.metrics.error(f"ao ler {source}", e)
+                    stats['errors'] += 1
+                flush(0)
+                if srt is not None:
+                    srt.close()
+    finally:
+        if out is not sys.stdout and out is not output:
+            out.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tradução em lote de capturas de tela e vídeos")
+    parser.add_argument('inputs', nargs='+', help="Imagens, pastas ou vídeos")
+    parser.add_argument('--output', default='ghosttext.jsonl',
+                        help="Arquivo JSONL de saída ('-' para a saída padrão)")
+    parser.add_argument('--srt-dir', help="Pasta para as legendas SRT dos vídeos")
+    parser.add_argument('--every', type=int, default=1, help="Usa um quadro a cada N (vídeos)")
+    parser.add_argument('--interval', type=float,
+                        help="Usa um quadro a cada N segundos (vídeos; substitui --every)")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Processos de OCR em paralelo")
+    args = parser.parse_args(argv)
+
+    output = args.output
+    if output == '-':
+        # A saída padrão fica só para o JSONL: as mensagens do motor, do
+        # tradutor e dos processos de OCR (que herdam o descritor 1) vão para
+        # a saída de erro
+        sys.stdout.flush()
+        output = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    config = load_config()
+    # No lote o log por quadro ficaria enorme: só os totais são mostrados
+    engine = TranslationEngine(config, metrics=Metrics(path=None), ocr_workers=args.workers)
+    try:
+        if not engine.wait_until_ready():
+            return 1
+        started = time.perf_counter()
+        stats = run_batch(engine, args.inputs, output, srt_dir=args.srt_dir,
+                          every=args.every, interval=args.interval, workers=args.workers)
+        elapsed = time.perf_counter() - started
+    finally:
+        engine.close()
+        if output is not args.output:
+            output.close()
+
+    print(f"{stats['frames']} quadros lidos, {stats['duplicates']} repetidos, "
+          f"{stats['processed']} traduzidos ({stats['processed'] / elapsed:.2f}/s), "
+          f"{stats['regions']} regiões, {stats['errors']} erros", file=sys.stderr)
+    return 0 if not stats['errors'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Benchmark do pipeline, sem interface: reproduz capturas de tela (por padrão
+as da pasta Images/) pelo scan do TranslationEngine e mede o tempo de cada
+etapa, separando a primeira passada (caches vazios) das seguintes.
+
+Uso:
+    python benchmark.py [--images Images] [--repeat 5] [--ocr easyocr]
+                        [--output arquivo.json] [--compare anterior.json]
+
+A tradução usa o tradutor 'stub' (sem rede), para medir só o custo local.
+Os resultados são gravados em JSON (em ~/.ghosttext/benchmarks por padrão)
+e podem ser comparados com os de outra versão com --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from capture import ReplayCapture
+from config import DATA_DIR, load_config
+from engine import TranslationEngine
+from metrics import Metrics, ScanMetrics
+from renderer import OverlayRenderer
+from translation import TranslationCache
+
+BENCHMARK_DIR = os.path.join(DATA_DIR, 'benchmarks')
+
+# Etapas medidas, na ordem do scan (ocr a translate vêm do ScanMetrics do engine)
+STAGES = ('capture', 'ocr', 'track', 'colors', 'blur', 'translate', 'render', 'total')
+
+
+def _peak_rss_mb():
+    """Pico de memória residente do processo em MB (None se não disponível)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB, macOS em bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _git_revision():
+    """Commit atual do repositório (para identificar a versão medida)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _summarize(samples):
+    """Percentis (em ms) de uma lista de durações em segundos."""
+    if not samples:
+        return None
+    ms = np.array(samples) * 1000
+    return {
+        'count': len(samples),
+        'mean': float(ms.mean()),
+        'p50': float(np.percentile(ms, 50)),
+        'p90': float(np.percentile(ms, 90)),
+        'p99': float(np.percentile(ms, 99)),
+        'max': float(ms.max()),
+    }
+
+
+def run_benchmark(images, repeat=5, ocr_backend='easyocr', languages=('en',),
+                  preprocess=None, blur_mode='fast', font_size=14, trace_memory=False):
+    """
+    Executa o scan do TranslationEngine (translate_frame) em cada imagem
+    `repeat` vezes e retorna o relatório (dicionário com percentis por etapa,
+    vazão e memória). A primeira passada (caches vazios) e as seguintes
+    (leitor de OCR, OCR incremental e cache de traduções já preenchidos,
+    como em scans repetidos da mesma tela) são medidas separadamente.
+    """
+    config = load_config()
+    config.update({
+        'ocr_backend': ocr_backend, 'ocr_languages': list(languages),
+        'translator': 'stub', 'translation_memory': False, 'preprocess': preprocess,
+        'blur_mode': blur_mode, 'capture_backend': 'replay', 'capture_source': images,
+    })
+
+    started = time.perf_counter()
+    # Cache de traduções só em memória, para não misturar com o do usuário
+    engine = TranslationEngine(config, metrics=Metrics(path=None),
+                               translation_cache=TranslationCache(path=None))
+    if not engine.wait_until_ready():
+        engine.close()
+        raise RuntimeError(engine.ocr_engine.error or "Tradutor indisponível")
+    load_time = time.perf_counter() - started
+
+    renderer = OverlayRenderer(None)
+    capture = ReplayCapture(images, loop=False)
+    frames = len(capture.files) if capture.files is not None else None
+    capture.close()
+
+    timings = {'cold': {stage: [] for stage in STAGES}, 'warm': {stage: [] for stage in STAGES}}
+    regions_found = 0
+    memory_peaks = {}
+    if trace_memory:
+        tracemalloc.start()
+
+    def timed(step, func, *args, **kwargs):
+        # Pico de alocações das etapas medidas aqui (o OCR roda em outro processo)
+        if trace_memory:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - t0
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            memory_peaks[step] = max(peak, memory_peaks.get(step, 0.0))
+        return result, elapsed
+
+    run_started = time.perf_counter()
+    try:
+        for run in range(repeat):
+            stages = timings['cold' if run == 0 else 'warm']
+            capture = ReplayCapture(images, loop=False)
+            while True:
+                frame, seconds = timed('capture', capture.next_frame)
+                if frame is None:
+                    break
+                stages['capture'].append(seconds)
+
+                metrics = ScanMetrics('benchmark')
+                regions, seconds = timed('scan', engine.translate_frame, frame, metrics=metrics)
+                engine.metrics.emit(metrics)
+                regions = regions or []
+                for stage in STAGES:
+                    if stage in metrics.stages:
+                        stages[stage].append(metrics.stages[stage])
+
+                def render():
+                    for region in regions:
+                        renderer.compose(region, font_size)
+                _, render_seconds = timed('render', render)
+                stages['render'].append(render_seconds)
+
+                stages['total'].append(stages['capture'][-1] + seconds + render_seconds)
+                regions_found += len(regions)
+            capture.close()
+        elapsed = time.perf_counter() - run_started
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        patch_stats = engine.patches.stats()
+        engine.close()
+
+    scans = sum(len(stages['total']) for stages in timings.values())
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'images': images, 'frames': frames, 'repeat': repeat, 'ocr_backend': ocr_backend,
+            'languages': list(languages), 'preprocess': preprocess, 'blur_mode': blur_mode,
+        },
+        'ocr_load_seconds': load_time,
+        'scans': scans,
+        'regions_per_scan': regions_found / scans if scans else 0.0,
+        'throughput_fps': scans / elapsed if elapsed else 0.0,
+        'peak_rss_mb': _peak_rss_mb(),
+        'patch_store': patch_stats,
+        'stage_peak_traced_mb': memory_peaks or None,
+        'stages_ms': {kind: {stage: _summarize(samples) for stage, samples in stages.items()}
+                      for kind, stages in timings.items()},
+    }
+
+
+def print_report(report, baseline=None):
+    """Imprime a tabela de percentis (e a variação em relação a outro relatório)."""
+    print(f"Versão {report['revision'] or '?'} | {report['scans']} scans | "
+          f"{report['throughput_fps']:.2f} quadros/s | "
+          f"{report['regions_per_scan']:.1f} regiões/scan | "
+          f"OCR carregado em {report['ocr_load_seconds']:.1f}s")
+    if report['peak_rss_mb'] is not None:
+        print(f"Pico de memória: {report['peak_rss_mb']:.0f} MB")
+
+    header = f"{'etapa':<10}{'média':>10}{'p50':>10}{'p90':>10}{'p99':>10}"
+    if baseline:
+        header += f"{'p50 ant.':>10}{'variação':>10}"
+    for kind, title in (('cold', "Primeira passada (caches vazios)"),
+                        ('warm', "Passadas seguintes (caches preenchidos)")):
+        stages = report['stages_ms'][kind]
+        if not any(stages.values()):
+            continue
+        print(title)
+        print(header)
+        for stage in STAGES:
+            stats = stages.get(stage)
+            if not stats:
+                continue
+            line = (f"{stage:<10}{stats['mean']:>10.2f}{stats['p50']:>10.2f}"
+                    f"{stats['p90']:>10.2f}{stats['p99']:>10.2f}")
+            old = baseline['stages_ms'].get(kind, {}).get(stage) if baseline else None
+            if old:
+                change = (stats['p50'] - old['p50']) / old['p50'] * 100 if old['p50'] else 0.0
+                line += f"{old['p50']:>10.2f}{change:>+9.1f}%"
+            print(line)
+    if report['stage_peak_traced_mb']:
+        peaks = ', '.join(f"{stage} {mb:.1f} MB"
+                          for stage, mb in report['stage_peak_traced_mb'].items())
+        print(f"Pico de alocações por etapa (tracemalloc): {peaks}")
+
+
+def main(argv=None):
+    config = load_config()
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline do GhostText")
+    parser.add_argument('--images', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'Images'),
+        help="Imagem, pasta de imagens ou vídeo reproduzido (padrão: Images/)")
+    parser.add_argument('--repeat', type=int, default=5, help="Passadas pelo conjunto de imagens")
+    parser.add_argument('--ocr', default=config['ocr_backend'], help="Motor de OCR")
+    parser.add_argument('--no-preprocess', action='store_true',
+                        help="Desativa o pré-processamento antes do OCR")
+    parser.add_argument('--blur-mode', default=config['blur_mode'])
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Mede o pico de alocações de cada etapa (mais lento)")
+    parser.add_argument('--output', help="Arquivo JSON do resultado (padrão: ~/.ghosttext/benchmarks)")
+    parser.add_argument('--compare', help="Relatório JSON anterior para comparação")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        args.images, repeat=args.repeat, ocr_backend=args.ocr,
+        languages=config['ocr_languages'],
+        preprocess=None if args.no_preprocess else config['preprocess'],
+        blur_mode=args.blur_mode, trace_memory=args.trace_memory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{report['revision'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultado salvo em {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+# Extensões aceitas pela captura de reprodução
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.webm')
+
+
+class _BufferPool:
+    """
+    Buffers NumPy reaproveitados, separados por formato. Um buffer volta ao
+    pool quando o array entregue (e todas as suas views) deixa de ser usado,
+    em qualquer thread; até lá ele não é entregue de novo.
+    """
+
+    def __init__(self, max_free=2, max_shapes=4):
+        self.max_free = max_free      # Buffers livres guardados por formato
+        self.max_shapes = max_shapes  # Formatos mantidos (os menos usados saem)
+        self._free = OrderedDict()    # formato -> memórias livres
+        self._lock = threading.RLock()  # A devolução pode ocorrer dentro do lock (coleta)
+
+    def get(self, shape):
+        shape = tuple(shape)
+        with self._lock:
+            free = self._free.setdefault(shape, [])
+            self._free.move_to_end(shape)
+            storage = free.pop() if free else None
+            while len(self._free) > self.max_shapes:
+                self._free.popitem(last=False)
+        if storage is None:
+            storage = bytearray(int(np.prod(shape)))
+        # Array que não é dono da memória: as views apontam para ele (base),
+        # então ele só é coletado quando nenhuma view estiver em uso
+        array = np.ndarray(shape, dtype=np.uint8, buffer=storage)
+        weakref.finalize(array, self._put, shape, storage)
+        return array
+
+    def _put(self, shape, storage):
+        with self._lock:
+            free = self._free.get(shape)
+            if free is not None and len(free) < self.max_free:
+                free.append(storage)
+
+
+class MSSCapture:
+    """
+    Captura rápida via mss (DXGI/GDI no Windows, XShm no Linux), convertendo
+    BGRA -> RGB direto para um buffer NumPy reaproveitado entre capturas.
+
+    Uma única instância do mss atende todas as threads (protegida por um
+    lock): cada scan roda em uma thread nova, e uma instância por thread
+    nunca seria fechada. Os buffers vêm de um pool por formato, compartilhado
+    entre as threads: o quadro retornado continua válido enquanto for usado.
+    """
+
+    name = 'mss'
+
+    def __init__(self):
+        import mss  # noqa: F401 - falha cedo se o mss não estiver instalado
+        self._sct = None
+        self._lock = threading.Lock()
+        self._buffers = _BufferPool()
+
+    def grab(self, bbox):
+        """Captura a área (x1, y1, x2, y2) da tela e retorna um array RGB."""
+        import cv2
+        import mss
+
+        x1, y1, x2, y2 = bbox
+        with self._lock:
+            if self._sct is None:
+                self._sct = mss.mss()
+            shot = self._sct.grab({'left': x1, 'top': y1, 'width': x2 - x1, 'height': y2 - y1})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+        buffer = self._buffers.get((shot.height, shot.width, 3))
+        cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=buffer)
+        return buffer
+
+    def close(self):
+        with self._lock:
+            if self._sct is not None:
+                self._sct.close()
+                self._sct = None
+
+
+class PILCapture:
+    """Captura com PIL.ImageGrab (mais lenta; usada quando o mss não está instalado)."""
+
+    name = 'pil'
+
+    def grab(self, bbox):
+        from PIL import ImageGrab
+        return np.asarray(ImageGrab.grab(bbox=bbox).convert('RGB'))
+
+    def close(self):
+        pass
+
+
+class ReplayCapture:
+    """
+    Reproduz imagens (arquivo ou pasta) ou um vídeo no lugar da tela, para
+    testes e benchmarks. Cada grab retorna o próximo quadro, recortado na bbox.
+    """
+
+    name = 'replay'
+
+    def __init__(self, source, loop=True):
+        self.source = source
+        self.loop = loop
+        self._video = None
+        self._index = 0
+
+        if os.path.isdir(source):
+            self.files = sorted(
+                os.path.join(source, name) for name in os.listdir(source)
+                if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif source.lower().endswith(VIDEO_EXTENSIONS):
+            import cv2
+            self.files = None
+            self._video = cv2.VideoCapture(source)
+            if not self._video.isOpened():
+                raise ValueError(f"Não foi possível abrir o vídeo: {source}")
+        else:
+            self.files = [source]
+
+        if self.files is not None and not self.files:
+            raise ValueError(f"Nenhuma imagem encontrada em: {source}")
+
+    def next_frame(self):
+        """Retorna o próximo quadro inteiro (RGB) ou None ao final (sem loop)."""
+        if self._video is not None:
+            import cv2
+            ok, frame = self._video.read()
+            if not ok and self.loop:
+                self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ok, frame = self._video.read()
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if ok else None
+
+        if self._index >= len(self.files):
+            if not self.loop:
+                return None
+            self._index = 0
+        from PIL import Image
+        with Image.open(self.files[self._index]) as image:
+            frame = np.asarray(image.convert('RGB'))
+        self._index += 1
+        return frame
+
+    def grab(self, bbox):
+        frame = self.next_frame()
+        if frame is None:
+            return None
+        x1, y1, x2, y2 = bbox
+        return frame[y1:y2, x1:x2]
+
+    def close(self):
+        if self._video is not None:
+            self._video.release()
+
+
+def create_capture(name='auto', source=None):
+    """
+    Cria a captura pelo nome: 'mss', 'pil', 'replay' (source = arquivo, pasta
+    ou vídeo) ou 'auto' (mss se estiver instalado, senão PIL).
+    """
+    if name == 'replay':
+        return ReplayCapture(source)
+    if name == 'pil':
+        return PILCapture()
+    if name == 'mss':
+        return MSSCapture()
+    if name == 'auto':
+        try:
+            return MSSCapture()
+        except ImportError:
+            return PILCapture()
+    raise ValueError(f"Captura desconhecida: {name} (disponíveis: auto, mss, pil, replay)")
@@ -0,0 +1,63 @@
+import json
+import os
+
+# Pasta onde ficam os dados persistentes do GhostText
+DATA_DIR = os.path.join(os.path.expanduser('~'), '.ghosttext')
+CONFIG_PATH = os.path.join(DATA_DIR, 'config.json')
+
+# Valores padrão (o arquivo de configuração só precisa conter o que mudar)
+DEFAULTS = {
+    'ocr_backend': 'easyocr',      # easyocr, tesseract ou rapidocr
+    'ocr_languages': ['en'],
+    'translator': 'google',        # google, argos, marian ou stub
+    'source_lang': 'en',           # 'auto' detecta o idioma de cada região entre os auto_languages
+    'target_lang': 'pt',
+    'auto_languages': ['ja', 'ko', 'en'],  # Idiomas do OCR no modo 'auto'
+    'max_ocr_readers': 3,          # Leitores de OCR (um por grupo de idiomas) mantidos carregados
+    'ocr_memory_mb': None,         # Limite de memória estimada do processo de OCR para manter leitores extras
+    'translation_timeout': 10.0,   # Segundos por requisição do tradutor de rede (google)
+    'marian_model': None,          # Modelo MarianMT (padrão: Helsinki-NLP/opus-mt-<origem>-<destino>)
+    'blur_mode': 'fast',           # gaussian, fast, box, pixelate ou mean (ver image_ops.blur_regions)
+    'overlay_memory_mb': 64,       # Limite para os trechos borrados guardados (ver region_store.PatchStore)
+    'capture_backend': 'auto',     # auto (mss se instalado), mss, pil ou replay
+    'capture_source': None,        # Imagem, pasta ou vídeo usado pela captura 'replay'
+    'translation_memory': True,    # Memória de traduções e glossário (~/.ghosttext/memory.db e glossary.json)
+    'preprocess': {},              # Opções do preprocess.Preprocessor (null desativa o pré-processamento)
+    'metrics_log': True,           # Grava tempos e contadores de cada scan em ~/.ghosttext/metrics.jsonl
+    'show_metrics': False,         # Mostra na HUD os tempos do último scan
+    'profile_path': None,          # Arquivo .prof: executa os scans sob o cProfile
+}
+
+# Variáveis de ambiente que sobrescrevem a configuração
+ENV_OVERRIDES = {
+    'GHOSTTEXT_OCR': 'ocr_backend',
+    'GHOSTTEXT_TRANSLATOR': 'translator',
+    'GHOSTTEXT_SOURCE_LANG': 'source_lang',
+    'GHOSTTEXT_TARGET_LANG': 'target_lang',
+    'GHOSTTEXT_CAPTURE': 'capture_backend',
+    'GHOSTTEXT_CAPTURE_SOURCE': 'capture_source',
+    'GHOSTTEXT_PROFILE': 'profile_path',
+}
+
+
+def load_config(path=CONFIG_PATH):
+    """Carrega a configuração (padrões + arquivo JSON + variáveis de ambiente)."""
+    config = dict(DEFAULTS)
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                config.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Aviso: configuração inválida em {path}: {e}")
+
+    for env, key in ENV_OVERRIDES.items():
+        if os.environ.get(env):
+            config[key] = os.environ[env]
+    return config
+
+
+def save_config(config, path=CONFIG_PATH):
+    """Grava a configuração em JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
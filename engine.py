@@ -0,0 +1,394 @@
+import threading
+import time
+
+from capture import create_capture
+from config import load_config
+from image_ops import blur_regions, estimate_text_colors
+from metrics import DEFAULT_METRICS_PATH, Metrics, ScanMetrics, rss_bytes
+from multilang_ocr import OCR_CODES, detect_language, translation_code
+from ocr_worker import OCRWorker
+from region_store import PatchStore, Region
+from tracker import RegionTracker
+from translation import CachedTranslator, TranslationCache, create_translator
+from translation_memory import TranslationMemory
+
+
+class TranslationEngine:
+    """
+    Núcleo do GhostText, sem interface: captura, OCR, estimativa de cores,
+    blur e tradução. Não depende do Tk nem do módulo keyboard, então pode
+    ser usado pela HUD (OCR.py), pelo modo em lote e por benchmarks.
+
+    O processo de OCR e o tradutor carregam em segundo plano a partir da
+    criação; use wait_until_ready() antes do primeiro translate_frame().
+
+    Cada região retornada é um region_store.Region (acessível como
+    dicionário) com:
+        bbox            (x, y, w, h) em coordenadas absolutas da tela
+        orig_text       texto reconhecido
+        translation     texto traduzido (o original se a tradução falhar)
+        text_color      cor estimada do texto (hexadecimal)
+        outline_color   cor do contorno (hexadecimal)
+        blur_patch      trecho borrado do quadro (refeito do PatchStore a cada acesso)
+    """
+
+    def __init__(self, config=None, metrics=None, min_confidence=0.5, ocr_workers=1,
+                 translation_cache=None):
+        # Configuração (~/.ghosttext/config.json + variáveis GHOSTTEXT_*)
+        self.config = config or load_config()
+        self.min_confidence = min_confidence
+        self.ocr_workers = ocr_workers  # Processos de OCR (mais de um no modo em lote)
+        self.tracker = RegionTracker()
+
+        # Trechos borrados das regiões, compactos e com limite de memória
+        # (o blur 'pixelate' perderia os blocos se fosse guardado reduzido)
+        self.patches = PatchStore(max_bytes=self.config['overlay_memory_mb'] * 1024 * 1024)
+        self._patch_scale = 1 if self.config['blur_mode'] == 'pixelate' else None
+
+        # Tempos (em segundos) de cada etapa do carregamento
+        self.startup_times = {}
+
+        # Tempos e contadores de cada scan (log JSONL e cProfile opcional)
+        self.metrics = metrics or Metrics(
+            DEFAULT_METRICS_PATH if self.config['metrics_log'] else None,
+            profile_path=self.config['profile_path'])
+
+        # Idioma de origem ('auto' detecta o idioma de cada região entre os
+        # auto_languages) e idiomas do OCR correspondentes; trocáveis sem
+        # reiniciar (set_language)
+        self.source_lang = self.config['source_lang']
+        self.ocr_languages = self._ocr_languages_for(self.source_lang)
+
+        # Motor de OCR (EasyOCR por padrão, ou o configurado) em um processo
+        # separado, com OCR incremental (só as partes da captura que mudaram)
+        started = time.perf_counter()
+        self.ocr_backend = self.config['ocr_backend']
+        self.ocr_engine = self._create_ocr_engine(self.ocr_backend)
+        self.startup_times['ocr_process_start'] = time.perf_counter() - started
+
+        # Captura de tela (mss com buffer reaproveitado, ou PIL.ImageGrab)
+        self.capture = create_capture(self.config['capture_backend'],
+                                      source=self.config['capture_source'])
+
+        # O tradutor é criado em segundo plano (_load_components)
+        self.translation_cache = translation_cache if translation_cache is not None \
+            else TranslationCache()
+        self.memory = None
+        self.translator = None  # Tradutor do idioma de origem principal
+        self._translators = {}  # Idioma de origem -> CachedTranslator (None se falhou)
+        self._translators_lock = threading.Lock()
+        self.components_ready = threading.Event()
+        threading.Thread(target=self._load_components, name='load', daemon=True).start()
+
+    def _create_ocr_engine(self, backend):
+        return OCRWorker(backend=backend, languages=self.ocr_languages, gpu=False,
+                         num_workers=self.ocr_workers, slots=2 * self.ocr_workers + 2,
+                         preprocess=self.config['preprocess'],
+                         max_readers=self.config['max_ocr_readers'],
+                         max_memory_mb=self.config['ocr_memory_mb'])
+
+    def _load_components(self):
+        """Carrega em segundo plano os módulos pesados e o tradutor."""
+        try:
+            started = time.perf_counter()
+            import cv2  # noqa: F401 - aquece o import usado no processamento de imagem
+            self.startup_times['cv2_import'] = time.perf_counter() - started
+
+            # Memória de traduções (correções do usuário, glossário e textos
+            # quase iguais já traduzidos), consultada antes do tradutor
+            started = time.perf_counter()
+            if self.config['translation_memory']:
+                self.memory = TranslationMemory()
+                self.memory.preload(self._default_source(), self.config['target_lang'])
+            self.startup_times['translation_memory'] = time.perf_counter() - started
+
+            # Inicializa o tradutor configurado (GoogleTranslator via deep-translator
+            # por padrão; argos/marian traduzem offline e 'stub' é para testes)
+            # com um cache persistente na frente
+            started = time.perf_counter()
+            self.translator = self._create_translator(self._default_source())
+            self._translators[self._default_source()] = self.translator
+            self.startup_times['translator'] = time.perf_counter() - started
+        except Exception as e:
+            self.metrics.error("ao carregar o tradutor", e)
+        finally:
+            self.components_ready.set()
+
+    def _create_translator(self, source):
+        # O modelo Marian configurado vale só para o par de idiomas da configuração
+        marian_model = self.config['marian_model'] if source == self.config['source_lang'] else None
+        base_translator = create_translator(
+            self.config['translator'], source=source, target=self.config['target_lang'],
+            marian_model=marian_model, timeout=self.config['translation_timeout'])
+        return CachedTranslator(base_translator, self.translation_cache,
+                                timeout=self.config['translation_timeout'], memory=self.memory)
+
+    def translator_for(self, source):
+        """
+        Tradutor do idioma de origem `source`, criado na primeira vez e
+        mantido carregado (None se não puder ser criado).
+        """
+        with self._translators_lock:
+            if source not in self._translators:
+                try:
+                    self._translators[source] = self._create_translator(source)
+                except Exception as e:
+                    self.metrics.error(f"ao carregar o tradutor de '{source}'", e)
+                    self._translators[source] = None
+            return self._translators[source]
+
+    def _default_source(self):
+        """Idioma de origem principal (no modo 'auto', o primeiro dos auto_languages)."""
+        if self.source_lang != 'auto':
+            return self.source_lang
+        return translation_code(self.config['auto_languages'][0])
+
+    def _ocr_languages_for(self, source):
+        """Idiomas do OCR para um idioma de origem."""
+        if source == 'auto':
+            return list(self.config['auto_languages'])
+        if source == self.config['source_lang']:
+            return list(self.config['ocr_languages'])
+        code = OCR_CODES.get(source, source)
+        return [code] if code == 'en' else [code, 'en']
+
+    def set_language(self, source, ocr_languages=None):
+        """
+        Troca o idioma de origem sem reiniciar: 'auto' detecta o idioma de
+        cada região (entre os auto_languages). Os leitores de OCR e os
+        tradutores já carregados continuam em cache no processo, então voltar
+        a um idioma usado antes é imediato.
+        """
+        self.source_lang = source
+        self.ocr_languages = list(ocr_languages) if ocr_languages else self._ocr_languages_for(source)
+
+    def source_for(self, text, languages=None):
+        """Idioma de origem (código do tradutor) de um texto reconhecido."""
+        if self.source_lang != 'auto' and languages is None:
+            return self.source_lang
+        candidates = languages or self.ocr_languages
+        default = self.source_lang if self.source_lang != 'auto' else 'en'
+        return translation_code(detect_language(text, candidates, default=OCR_CODES.get(default, default)))
+
+    def is_loaded(self):
+        """True quando o carregamento terminou (com sucesso ou não)."""
+        return self.components_ready.is_set() and self.ocr_engine.ready.is_set()
+
+    @property
+    def failed(self):
+        """True se o OCR ou o tradutor não puderam ser carregados."""
+        return bool(self.ocr_engine.error) or self.translator is None
+
+    def wait_until_ready(self):
+        """Bloqueia até o OCR e o tradutor estarem prontos; False se falharam."""
+        self.components_ready.wait()
+        self.ocr_engine.ready.wait()
+        if self.failed:
+            print("Erro: OCR ou tradutor indisponível.")
+            return False
+        for stage, seconds in self.ocr_engine.load_times.items():
+            self.startup_times['ocr_' + stage] = seconds
+        return True
+
+    def switch_ocr_backend(self, name):
+        """
+        Carrega outro motor de OCR em um novo processo, sem reiniciar. O motor
+        antigo é encerrado em segundo plano (pedidos pendentes nele retornam
+        como substituídos). Retorna o novo OCRWorker (ver .ready e .error).
+        """
+        old_engine = self.ocr_engine
+        self.ocr_backend = name
+        self.ocr_engine = self._create_ocr_engine(name)
+        threading.Thread(target=old_engine.close, daemon=True).start()
+        return self.ocr_engine
+
+    def grab(self, bbox):
+        """Captura a área (x1, y1, x2, y2) da tela como array RGB."""
+        return self.capture.grab(bbox)
+
+    def translate_frame(self, image, bbox=None, ocr_key=None, metrics=None, with_overlay=True,
+                        previous=None, languages=None):
+        """
+        Executa OCR e tradução em uma imagem (RGB, NumPy) e retorna a lista
+        de regiões encontradas. bbox é a área (x1, y1, x2, y2) da tela que a
+        imagem representa (as regiões saem em coordenadas absolutas); ocr_key
+        identifica a área para o OCR incremental entre chamadas. Retorna None
+        se o pedido de OCR foi substituído por outro mais recente da mesma área.
+        Tempos e contadores de cada etapa são somados em `metrics`.
+
+        previous: regiões do scan anterior dessa área. Textos que continuam
+        na tela (ver tracker.RegionTracker) reaproveitam a tradução; os que
+        não mudaram nem se moveram são retornados como o próprio objeto
+        anterior, o que permite ao chamador redesenhar só o que mudou.
+
+        Com with_overlay=False as cores e o blur não são calculados (ficam
+        None): só texto e tradução, para o modo em lote. languages troca os
+        idiomas do OCR só desta chamada (ex.: uma zona em japonês); o idioma
+        de origem de cada região é então detectado pelo texto.
+        """
+        metrics = metrics or ScanMetrics()
+        x_offset = bbox[0] if bbox else 0
+        y_offset = bbox[1] if bbox else 0
+
+        # Executa OCR - detecta blocos de texto completos
+        with metrics.stage('ocr'):
+            ocr_results = self.ocr_engine.readtext(
+                image, key=ocr_key, languages=languages or self.ocr_languages)
+        if ocr_results is None:
+            return None
+
+        # Coleta todos os textos primeiro
+        regions_data = []
+        for bbox_pts, orig_text, confidence in ocr_results:
+            if confidence < self.min_confidence or orig_text.strip() == '':
+                continue
+
+            xs = [int(pt[0]) for pt in bbox_pts]
+            ys = [int(pt[1]) for pt in bbox_pts]
+            x, y = min(xs), min(ys)
+            w, h = max(xs) - x, max(ys) - y
+            regions_data.append((x, y, w, h, orig_text))
+
+        metrics.count('regions_found', len(ocr_results))
+        metrics.count('regions_filtered', len(ocr_results) - len(regions_data))
+
+        # Associa as caixas às do scan anterior (coordenadas absolutas)
+        with metrics.stage('track'):
+            matches = self.tracker.match(
+                previous, [(x + x_offset, y + y_offset, w, h, text)
+                           for x, y, w, h, text in regions_data])
+
+        regions = [None] * len(regions_data)
+        pending = []  # Índices que precisam de cores e blur novos
+        for i, match in enumerate(matches):
+            if match is not None and match[1] and match[2]:
+                regions[i] = match[0]  # Mesmo texto, mesma posição: nada muda
+            else:
+                pending.append(i)
+        metrics.count('regions_kept', len(regions_data) - len(pending))
+
+        # Estima as cores do texto e do contorno e aplica o blur em todas as
+        # regiões de uma vez, sobre o quadro inteiro
+        boxes = [regions_data[i][:4] for i in pending]
+        if with_overlay:
+            with metrics.stage('colors'):
+                colors = estimate_text_colors(image, boxes)
+            with metrics.stage('blur'):
+                patches = blur_regions(image, boxes, mode=self.config['blur_mode'])
+        else:
+            colors = [(None, None)] * len(boxes)
+            patches = [None] * len(boxes)
+
+        # Traduz de uma vez só os textos novos; regiões cuja tradução falhar
+        # mantêm o texto original, e as associadas a uma região anterior
+        # (deslocadas ou com o texto um pouco diferente) mantêm a tradução dela
+        new = [i for i in pending if matches[i] is None]
+        with metrics.stage('translate'):
+            texts = [regions_data[i][4] for i in new]
+            sources = [self.source_for(text, languages) for text in texts]
+            translations = dict(zip(new, self.translate_texts(texts, metrics, sources)))
+
+        for i, (text_color, outline_color), patch in zip(pending, colors, patches):
+            x, y, w, h, orig_text = regions_data[i]
+            if matches[i] is not None:
+                # Texto já conhecido: fica o texto lido agora, com a tradução anterior
+                translation = matches[i][0]['translation']
+            else:
+                translation = translations[i]
+            # Ajusta para coordenadas absolutas da tela; o blur é copiado para o
+            # PatchStore (compacto), sem manter o quadro borrado inteiro
+            regions[i] = Region((x + x_offset, y + y_offset, w, h), orig_text, translation,
+                                text_color, outline_color, patch, self.patches, self._patch_scale)
+
+        # Memória ocupada, para acompanhar sessões longas (log de métricas)
+        for name, value in self.footprint().items():
+            metrics.gauge(name, value)
+        return regions
+
+    def footprint(self):
+        """Memória das regiões, caches e do processo (valores atuais)."""
+        stats = self.patches.stats()
+        footprint = {
+            'regions': stats['patches'],
+            'patch_kb': stats['patch_bytes'] // 1024,
+            'patches_evicted': stats['patches_evicted'],
+            'cache_entries': self.translation_cache.stats()['memory_entries'],
+        }
+        if self.memory is not None:
+            footprint['memory_entries'] = self.memory.stats()['entries']
+        rss = rss_bytes()
+        if rss is not None:
+            footprint['rss_mb'] = rss // (1024 * 1024)
+        return footprint
+
+    def translate_texts(self, texts, metrics=None, sources=None):
+        """
+        Traduz uma lista de textos em lote (um lote por idioma de origem, ver
+        sources); falhas mantêm o texto original.
+        """
+        metrics = metrics or ScanMetrics()
+        sources = sources or [self.source_lang if self.source_lang != 'auto'
+                              else self._default_source()] * len(texts)
+        by_source = {}
+        for i, source in enumerate(sources):
+            by_source.setdefault(source, []).append(i)
+
+        hits_before = self.translation_cache.hits
+        results = [None] * len(texts)
+        for source, indices in by_source.items():
+            translator = self.translator_for(source)
+            if translator is None:
+                continue
+            if len(by_source) > 1 or source != self._default_source():
+                metrics.count(f'source_{source}', len(indices))
+            for i, translation in zip(indices, translator.translate_batch(
+                    [texts[i] for i in indices])):
+                results[i] = translation
+        metrics.count('cache_hits', self.translation_cache.hits - hits_before)
+
+        failures = 0
+        translations = []
+        for text, translation in zip(texts, results):
+            if translation is None:
+                failures += 1
+                translation = text
+            translations.append(translation)
+        metrics.count('translation_failures', failures)
+        return translations
+
+    def remember(self, orig_text, translation):
+        """
+        Registra uma tradução corrigida pelo usuário: passa a ter prioridade
+        sobre o cache e o tradutor nesta e nas próximas sessões.
+        """
+        translator = self.translator_for(self.source_for(orig_text))
+        if translator is None or not translation:
+            return
+        translator.cache.put(translator.source, translator.target, orig_text, translation)
+        if self.memory is not None:
+            self.memory.add(translator.source, translator.target, orig_text, translation,
+                            origin='user')
+
+    def close(self):
+        """Encerra o OCR, a captura, o tradutor e grava as estatísticas."""
+        stats = self.translation_cache.stats()
+        print(f"Cache de traduções: {stats['hits']} acertos, {stats['misses']} falhas "
+              f"({stats['hit_rate']:.0%})")
+        totals = ', '.join(f"{name} {value}" for name, value in self.metrics.totals.items())
+        if self.memory is not None:
+            memory = self.memory.stats()
+            print(f"Memória de traduções: {memory['entries']} entradas, "
+                  f"{memory['exact_hits']} exatas, {memory['fuzzy_hits']} aproximadas, "
+                  f"{memory['glossary_hits']} do glossário")
+        print("Memória: " + ', '.join(f"{name} {value}" for name, value in self.footprint().items()))
+        print(f"Scans: {self.metrics.scans} ({totals or 'sem contadores'}), "
+              f"{self.metrics.errors} erros")
+        for translator in self._translators.values():
+            if translator is not None:
+                translator.close()
+        self.ocr_engine.close()
+        self.capture.close()
+        self.translation_cache.close()
+        if self.memory is not None:
+            self.memory.close()
+        self.metrics.close()
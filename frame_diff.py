@@ -0,0 +1,137 @@
+import numpy as np
+
+
+def group_tiles(mask):
+    """
+    Agrupa blocos marcados vizinhos (vizinhança de 8) de uma matriz booleana.
+    Retorna os retângulos (linha1, coluna1, linha2, coluna2) de cada grupo.
+    """
+    visited = np.zeros_like(mask, dtype=bool)
+    groups = []
+    for row, col in zip(*np.nonzero(mask)):
+        row, col = int(row), int(col)
+        if visited[row, col]:
+            continue
+        stack = [(row, col)]
+        visited[row, col] = True
+        r1, c1, r2, c2 = row, col, row, col
+        while stack:
+            r, c = stack.pop()
+            r1, c1, r2, c2 = min(r1, r), min(c1, c), max(r2, r), max(c2, c)
+            for nr in (r - 1, r, r + 1):
+                for nc in (c - 1, c, c + 1):
+                    if (0 <= nr < mask.shape[0] and 0 <= nc < mask.shape[1]
+                            and mask[nr, nc] and not visited[nr, nc]):
+                        visited[nr, nc] = True
+                        stack.append((nr, nc))
+        groups.append((r1, c1, r2, c2))
+    return groups
+
+
+def rects_overlap(a, b):
+    """Se dois retângulos (x1, y1, x2, y2) se sobrepõem."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def grow_areas(areas, boxes, width, height, margin=0):
+    """
+    Cresce cada área (x1, y1, x2, y2) até cobrir todas as caixas (x1, y1,
+    x2, y2) de texto que ela toca, com margem, e une as áreas que passam a se
+    sobrepor, até nada mais mudar. As áreas retornadas não se sobrepõem, então
+    cada texto fica inteiro em uma única área.
+    """
+    areas = list(areas)
+    changed = True
+    while changed:
+        changed = False
+        for i, (x1, y1, x2, y2) in enumerate(areas):
+            for box in boxes:
+                if rects_overlap(box, (x1, y1, x2, y2)):
+                    grown = (max(0, min(x1, box[0] - margin)), max(0, min(y1, box[1] - margin)),
+                             min(width, max(x2, box[2] + margin)),
+                             min(height, max(y2, box[3] + margin)))
+                    if grown != (x1, y1, x2, y2):
+                        x1, y1, x2, y2 = grown
+                        changed = True
+            areas[i] = (x1, y1, x2, y2)
+
+        # Une as áreas que se sobrepõem
+        merged = []
+        for area in areas:
+            for j, other in enumerate(merged):
+                if rects_overlap(area, other):
+                    merged[j] = (min(area[0], other[0]), min(area[1], other[1]),
+                                 max(area[2], other[2]), max(area[3], other[3]))
+                    changed = True
+                    break
+            else:
+                merged.append(area)
+        areas = merged
+    return areas
+
+
+class FrameDiffer:
+    """
+    Compara quadros capturados com o último quadro processado usando uma
+    versão reduzida em escala de cinza, dividida em blocos (tiles).
+    Retorna apenas as áreas que mudaram, para que o OCR rode só nelas.
+    """
+
+    def __init__(self, tile_size=128, scale=8, pixel_threshold=20, min_changed_pixels=2):
+        self.tile_size = tile_size            # Tamanho do bloco em pixels da tela
+        self.scale = scale                    # Fator de redução da assinatura
+        self.pixel_threshold = pixel_threshold  # Diferença mínima de brilho por pixel
+        self.min_changed_pixels = min_changed_pixels  # Pixels alterados para marcar o bloco
+        self._reference = None
+        self._frame_shape = None
+
+    def reset(self):
+        """Esquece o último quadro processado (o próximo será considerado todo alterado)."""
+        self._reference = None
+        self._frame_shape = None
+
+    def _signature(self, frame):
+        """Reduz o quadro (RGB) para uma imagem pequena em escala de cinza."""
+        import cv2  # Import adiado: só é necessário no modo contínuo
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        h, w = gray.shape
+        small_w = max(1, w // self.scale)
+        small_h = max(1, h // self.scale)
+        return cv2.resize(gray, (small_w, small_h), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def changed_tiles(self, frame):
+        """
+        Retorna uma matriz booleana (linhas x colunas de blocos) indicando
+        quais blocos mudaram em relação ao último quadro processado.
+        """
+        signature = self._signature(frame)
+        tile = max(1, self.tile_size // self.scale)
+        rows = -(-signature.shape[0] // tile)
+        cols = -(-signature.shape[1] // tile)
+
+        if self._reference is None or self._frame_shape != frame.shape:
+            return np.ones((rows, cols), dtype=bool)
+
+        changed = np.abs(signature - self._reference) > self.pixel_threshold
+        # Soma os pixels alterados por bloco (preenche a borda até múltiplo do bloco)
+        padded = np.zeros((rows * tile, cols * tile), dtype=np.int32)
+        padded[:changed.shape[0], :changed.shape[1]] = changed
+        counts = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+        return counts >= self.min_changed_pixels
+
+    def changed_areas(self, frame, margin=0):
+        """
+        Agrupa blocos alterados vizinhos e retorna os retângulos (x1, y1, x2, y2)
+        em coordenadas do quadro. Lista vazia significa quadro inalterado.
+        """
+        tiles = self.changed_tiles(frame)
+        h, w = frame.shape[:2]
+        step = max(1, self.tile_size // self.scale) * self.scale
+        return [(max(0, c1 * step - margin), max(0, r1 * step - margin),
+                 min(w, (c2 + 1) * step + margin), min(h, (r2 + 1) * step + margin))
+                for r1, c1, r2, c2 in group_tiles(tiles)]
+
+    def commit(self, frame):
+        """Marca o quadro como processado (nova referência para as comparações)."""
+        self._reference = self._signature(frame)
+        self._frame_shape = frame.shape
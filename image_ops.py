@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def to_gray(frame):
+    """Converte um quadro RGB (NumPy) para escala de cinza uint8."""
+    import cv2  # Import adiado para não atrasar a abertura da HUD
+    return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+
+def _otsu_thresholds(histograms):
+    """Limiar de Otsu para cada linha de uma matriz de histogramas (n x 256)."""
+    levels = np.arange(256, dtype=np.float64)
+    total = histograms.sum(axis=1, keepdims=True)
+    total[total == 0] = 1
+    prob = histograms / total
+    omega = np.cumsum(prob, axis=1)            # Peso da classe escura até cada nível
+    mu = np.cumsum(prob * levels, axis=1)      # Média acumulada
+    mu_total = mu[:, -1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = (mu_total * omega - mu) ** 2 / (omega * (1 - omega))
+    between = np.nan_to_num(between, nan=0.0, posinf=0.0)
+    return between.argmax(axis=1)
+
+
+def estimate_text_colors(frame, boxes, gray=None):
+    """
+    Estima a cor do texto e a cor do contorno de todas as regiões de uma vez.
+
+    frame: quadro RGB (H x W x 3, uint8); boxes: lista de (x, y, w, h) em
+    coordenadas do quadro; gray: o quadro em escala de cinza, se já calculado.
+    Em cada caixa os pixels são separados em duas classes pelo limiar de Otsu
+    e a classe minoritária é considerada o texto. Retorna uma lista de
+    (cor do texto, cor do contorno) em hexadecimal.
+    """
+    if not boxes:
+        return []
+    if gray is None:
+        gray = to_gray(frame)
+
+    height, width = gray.shape
+    views = []
+    for x, y, w, h in boxes:
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(width, x + w), min(height, y + h)
+        views.append((slice(y1, max(y1, y2)), slice(x1, max(x1, x2))))
+
+    # Junta os pixels de todas as regiões em vetores únicos, com o índice da região
+    sizes = np.array([gray[v].size for v in views])
+    ids = np.repeat(np.arange(len(views)), sizes)
+    values = np.concatenate([gray[v].ravel() for v in views]).astype(np.int64)
+    rgb = np.concatenate([frame[v].reshape(-1, 3) for v in views]).astype(np.float64)
+
+    # Histograma de cada região e limiar de Otsu, tudo vetorizado
+    histograms = np.bincount(ids * 256 + values, minlength=len(views) * 256)
+    thresholds = _otsu_thresholds(histograms.reshape(len(views), 256).astype(np.float64))
+
+    # O texto é a classe com menos pixels (claros ou escuros) em cada caixa
+    bright = values > thresholds[ids]
+    bright_count = np.bincount(ids, weights=bright, minlength=len(views))
+    text_is_bright = bright_count < sizes / 2
+    is_text = bright == text_is_bright[ids]
+
+    text_ids = ids[is_text]
+    counts = np.bincount(text_ids, minlength=len(views))
+    sums = np.stack([np.bincount(text_ids, weights=rgb[is_text, c], minlength=len(views))
+                     for c in range(3)], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        colors = np.where(counts[:, None] > 0, sums / counts[:, None], 0).astype(int)
+
+    # Contorno claro para texto escuro e vice-versa
+    brightness = np.sqrt(colors ** 2 @ np.array([0.299, 0.587, 0.114]))
+    return [('#{:02x}{:02x}{:02x}'.format(*color), '#ffffff' if light < 127 else '#000000')
+            for color, light in zip(colors, brightness)]
+
+
+# Modos de blur, do mais fiel ao mais rápido
+BLUR_MODES = ('gaussian', 'fast', 'box', 'pixelate', 'mean')
+
+
+def blur_regions(frame, boxes, mode='fast', radius=5):
+    """
+    Borra o quadro uma única vez e retorna, para cada caixa (x, y, w, h), uma
+    view (sem cópia) do trecho borrado correspondente.
+
+    Modos: 'gaussian' (cv2.GaussianBlur, igual ao blur anterior do PIL),
+    'fast' (reduz, borra e amplia), 'box' (média simples), 'pixelate'
+    (blocos) e 'mean' (preenche com a cor média da caixa).
+    """
+    if not boxes:
+        return []
+    if mode not in BLUR_MODES:
+        raise ValueError(f"Modo de blur desconhecido: {mode} (disponíveis: {', '.join(BLUR_MODES)})")
+    import cv2  # Import adiado para não atrasar a abertura da HUD
+
+    height, width = frame.shape[:2]
+    clipped = []
+    for x, y, w, h in boxes:
+        x1, y1 = max(0, x), max(0, y)
+        clipped.append((x1, y1, max(x1, min(width, x + w)), max(y1, min(height, y + h))))
+
+    if mode == 'mean':
+        # Cor constante: np.broadcast_to não aloca a imagem inteira
+        patches = []
+        for x1, y1, x2, y2 in clipped:
+            view = frame[y1:y2, x1:x2]
+            color = view.reshape(-1, 3).mean(axis=0) if view.size else np.zeros(3)
+            patches.append(np.broadcast_to(color.astype(np.uint8), view.shape))
+        return patches
+
+    # Borra apenas o retângulo que cobre todas as caixas (com folga para o kernel)
+    margin = 3 * radius
+    ux1 = max(0, min(b[0] for b in clipped) - margin)
+    uy1 = max(0, min(b[1] for b in clipped) - margin)
+    ux2 = min(width, max(b[2] for b in clipped) + margin)
+    uy2 = min(height, max(b[3] for b in clipped) + margin)
+    area = frame[uy1:uy2, ux1:ux2]
+    area_h, area_w = area.shape[:2]
+
+    if mode == 'gaussian':
+        blurred = cv2.GaussianBlur(area, (0, 0), radius)
+    elif mode == 'box':
+        blurred = cv2.blur(area, (2 * radius + 1, 2 * radius + 1))
+    elif mode == 'fast':
+        factor = max(1, radius // 2)
+        small = cv2.resize(area, (max(1, area_w // factor), max(1, area_h // factor)),
+                           interpolation=cv2.INTER_AREA)
+        small = cv2.GaussianBlur(small, (0, 0), radius / factor)
+        blurred = cv2.resize(small, (area_w, area_h), interpolation=cv2.INTER_LINEAR)
+    else:  # pixelate
+        block = 2 * radius
+        small = cv2.resize(area, (max(1, area_w // block), max(1, area_h // block)),
+                           interpolation=cv2.INTER_AREA)
+        blurred = cv2.resize(small, (area_w, area_h), interpolation=cv2.INTER_NEAREST)
+
+    return [blurred[y1 - uy1:y2 - uy1, x1 - ux1:x2 - ux1] for x1, y1, x2, y2 in clipped]
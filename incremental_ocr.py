@@ -0,0 +1,151 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from frame_diff import group_tiles, grow_areas, rects_overlap
+from ocr_backends import OCRResult
+
+
+def _content_hash(image):
+    """Hash rápido do conteúdo de uma imagem (NumPy)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).tobytes())
+    return digest.digest()
+
+
+def _result_bounds(result):
+    """Retorna (x1, y1, x2, y2) da caixa de um resultado de OCR."""
+    xs = [pt[0] for pt in result.box]
+    ys = [pt[1] for pt in result.box]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _offset_result(result, dx, dy):
+    """Desloca a caixa de um resultado de OCR, mantendo os demais campos."""
+    box = [[pt[0] + dx, pt[1] + dy] for pt in result.box]
+    return OCRResult(box, result.text, result.confidence)
+
+
+class IncrementalOCR:
+    """
+    OCR incremental sobre um motor de OCR (ver ocr_backends).
+
+    A captura é dividida em blocos (tiles) com hash do conteúdo. Para cada área
+    de captura (key) guarda-se o último resultado do OCR; em uma nova captura,
+    o reconhecimento só roda nos blocos que mudaram, e os textos das partes
+    inalteradas são reaproveitados. Áreas com conteúdo já visto (ex.: a mesma
+    caixa de diálogo reaparecendo) também são servidas pelo hash, sem OCR.
+    """
+
+    def __init__(self, backend, tile_size=128, margin=16, max_cached_areas=256, max_keys=4):
+        self.backend = backend
+        self.tile_size = tile_size
+        self.margin = margin  # Pixels extras ao redor das áreas alteradas
+        self.max_cached_areas = max_cached_areas
+        self.max_keys = max_keys
+
+        self._frames = OrderedDict()  # key -> (formato, hashes dos blocos, resultados)
+        self._area_cache = OrderedDict()  # hash do conteúdo -> resultados relativos
+
+        # Contadores para acompanhar o ganho
+        self.tiles_reused = 0
+        self.tiles_recognized = 0
+        self.area_cache_hits = 0
+
+    def reset(self):
+        """Descarta todos os resultados memorizados."""
+        self._frames.clear()
+        self._area_cache.clear()
+
+    def readtext(self, image, key=None):
+        """
+        Retorna a lista de OCRResult da imagem. Com key=None a imagem é tratada
+        como uma área avulsa (só o cache por conteúdo é usado); com uma key
+        (ex.: a bbox capturada) o OCR é incremental entre chamadas.
+        """
+        if key is None:
+            return self._recognize_area(image, 0, 0, image.shape[1], image.shape[0])
+
+        tiles = self._tile_hashes(image)
+        previous = self._frames.get(key)
+        if previous is None or previous[0] != image.shape:
+            results = self._recognize_area(image, 0, 0, image.shape[1], image.shape[0])
+            self.tiles_recognized += tiles.size
+        else:
+            results = self._update(image, tiles, previous)
+
+        self._frames[key] = (image.shape, tiles, results)
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_keys:
+            self._frames.popitem(last=False)
+        return list(results)
+
+    def _tile_hashes(self, image):
+        """Calcula o hash de cada bloco da imagem."""
+        h, w = image.shape[:2]
+        rows = -(-h // self.tile_size)
+        cols = -(-w // self.tile_size)
+        hashes = np.empty((rows, cols), dtype=object)
+        for r in range(rows):
+            for c in range(cols):
+                y, x = r * self.tile_size, c * self.tile_size
+                hashes[r, c] = _content_hash(
+                    image[y:y + self.tile_size, x:x + self.tile_size])
+        return hashes
+
+    def _update(self, image, tiles, previous):
+        """Reaproveita os resultados dos blocos inalterados e refaz o OCR no resto."""
+        _, old_tiles, old_results = previous
+        dirty = tiles != old_tiles
+        self.tiles_reused += int(dirty.size - np.count_nonzero(dirty))
+        if not dirty.any():
+            return old_results
+
+        h, w = image.shape[:2]
+        # Cresce as áreas até cobrir os textos antigos que tocam (para não
+        # reconhecer apenas parte de uma linha); cada texto é lido uma vez só
+        areas = grow_areas(self._dirty_areas(dirty, w, h),
+                           [_result_bounds(res) for res in old_results], w, h, self.margin)
+        kept = [res for res in old_results
+                if not any(rects_overlap(_result_bounds(res), area) for area in areas)]
+        results = []
+        for x1, y1, x2, y2 in areas:
+            self.tiles_recognized += -(-(x2 - x1) // self.tile_size) * \
+                -(-(y2 - y1) // self.tile_size)
+            results.extend(self._recognize_area(image, x1, y1, x2, y2))
+
+        # Textos novos podem ter invadido caixas de outras áreas: remove duplicatas
+        new_bounds = [_result_bounds(res) for res in results]
+        for res in kept:
+            bounds = _result_bounds(res)
+            if not any(rects_overlap(bounds, b) for b in new_bounds):
+                results.append(res)
+
+        # Mantém a ordem de leitura (de cima para baixo, da esquerda para a direita)
+        results.sort(key=lambda res: (_result_bounds(res)[1], _result_bounds(res)[0]))
+        return results
+
+    def _dirty_areas(self, dirty, w, h):
+        """Agrupa blocos alterados vizinhos em retângulos (x1, y1, x2, y2) com margem."""
+        return [(max(0, c1 * self.tile_size - self.margin),
+                 max(0, r1 * self.tile_size - self.margin),
+                 min(w, (c2 + 1) * self.tile_size + self.margin),
+                 min(h, (r2 + 1) * self.tile_size + self.margin))
+                for r1, c1, r2, c2 in group_tiles(dirty)]
+
+    def _recognize_area(self, image, x1, y1, x2, y2):
+        """Executa o OCR em uma área da imagem, usando o cache por conteúdo."""
+        crop = image[y1:y2, x1:x2]
+        digest = _content_hash(crop)
+        cached = self._area_cache.get(digest)
+        if cached is not None:
+            self._area_cache.move_to_end(digest)
+            self.area_cache_hits += 1
+        else:
+            cached = self.backend.readtext(crop)
+            self._area_cache[digest] = cached
+            while len(self._area_cache) > self.max_cached_areas:
+                self._area_cache.popitem(last=False)
+        return [_offset_result(res, x1, y1) for res in cached]
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import DATA_DIR
+
+DEFAULT_METRICS_PATH = os.path.join(DATA_DIR, 'metrics.jsonl')
+
+
+def rss_bytes():
+    """Memória residente atual do processo em bytes (None se não disponível)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ScanMetrics:
+    """
+    Tempos por etapa e contadores de um scan (ou de um ciclo do modo
+    contínuo). Etapas repetidas no mesmo scan somam seus tempos.
+    """
+
+    def __init__(self, kind='scan'):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.total = None
+        self.stages = {}    # etapa -> segundos
+        self.counters = {}  # contador -> valor
+        self.gauges = {}    # medida -> valor atual (ex.: memória), não somado
+
+    @contextmanager
+    def stage(self, name):
+        """Mede o tempo do bloco como a etapa `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def finish(self):
+        """Encerra a medição do tempo total."""
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self
+
+    def record(self):
+        """Registro estruturado (para o log JSONL)."""
+        self.finish()
+        return {
+            'event': self.kind,
+            'time': time.time(),
+            'total_ms': round(self.total * 1000, 2),
+            'stages_ms': {stage: round(seconds * 1000, 2) for stage, seconds in self.stages.items()},
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+        }
+
+    def summary(self):
+        """Resumo em texto do último scan (leitura na HUD)."""
+        self.finish()
+        lines = [f"{self.kind}: {self.total * 1000:.0f} ms"]
+        lines += [f"  {stage:<10}{seconds * 1000:7.1f} ms" for stage, seconds in self.stages.items()]
+        lines += [f"  {name}: {value}" for name, value in self.counters.items()]
+        lines += [f"  {name}: {value}" for name, value in self.gauges.items()]
+        return '\n'.join(lines)
+
+
+class Metrics:
+    """
+    Destino das métricas: grava cada scan como uma linha JSON (path=None
+    desativa o arquivo), acumula os contadores da sessão e registra erros.
+
+    Com profile_path, os scans são executados sob o cProfile e as
+    estatísticas são gravadas nesse arquivo ao fechar (abra com pstats ou
+    snakeviz). As threads e o processo de OCR têm nomes próprios, o que
+    facilita a leitura no py-spy.
+    """
+
+    def __init__(self, path=DEFAULT_METRICS_PATH, profile_path=None, max_bytes=10 * 1024 * 1024):
+        self.path = path
+        self.profile_path = profile_path
+        self.last = None    # ScanMetrics do último scan
+        self.scans = 0
+        self.errors = 0
+        self.totals = {}    # Contadores acumulados na sessão
+        self._lock = threading.Lock()
+
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Rotação simples: mantém um arquivo anterior
+            if os.path.exists(path) and os.path.getsize(path) > max_bytes:
+                os.replace(path, path + '.1')
+            self._file = open(path, 'a', encoding='utf-8')
+
+        self._profiler = None
+        self._profile_lock = threading.Lock()
+        if profile_path:
+            import cProfile
+            self._profiler = cProfile.Profile()
+
+    def emit(self, metrics):
+        """Registra um scan concluído."""
+        record = metrics.record()
+        with self._lock:
+            self.last = metrics
+            self.scans += 1
+            for name, value in metrics.counters.items():
+                self.totals[name] = self.totals.get(name, 0) + value
+            self._write(record)
+
+    def error(self, where, error):
+        """Registra um erro (exceção ou mensagem) no console e no log estruturado."""
+        print(f"Erro {where}: {error}")
+        with self._lock:
+            self.errors += 1
+            self._write({'event': 'error', 'time': time.time(), 'where': where,
+                         'type': type(error).__name__ if isinstance(error, Exception) else None,
+                         'message': str(error)})
+
+    def _write(self, record):
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    @contextmanager
+    def profile(self):
+        """Executa o bloco sob o cProfile (se ativado); um scan por vez."""
+        if self._profiler is None or not self._profile_lock.acquire(blocking=False):
+            yield
+            return
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+            self._profile_lock.release()
+
+    def close(self):
+        """Grava o perfil (se ativado) e fecha o log."""
+        if self._profiler is not None:
+            with self._profile_lock:
+                self._profiler.dump_stats(self.profile_path)
+            print(f"Perfil dos scans salvo em {self.profile_path}")
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,234 @@
+import gc
+import time
+from collections import OrderedDict
+
+from metrics import rss_bytes
+from ocr_backends import OCRResult
+
+# Idiomas que o EasyOCR só carrega junto com o inglês: cada um tem seu leitor
+EXCLUSIVE_LANGUAGES = ('ja', 'ko', 'ch_sim', 'ch_tra', 'th')
+
+# Sistema de escrita -> idiomas do OCR que o usam (o primeiro é o padrão)
+SCRIPT_LANGUAGES = {
+    'kana': ('ja',),
+    'hangul': ('ko',),
+    'han': ('ja', 'ch_sim', 'ch_tra'),
+    'thai': ('th',),
+}
+
+# Códigos do OCR (EasyOCR) -> códigos dos tradutores, quando diferem
+TRANSLATION_CODES = {'ch_sim': 'zh-CN', 'ch_tra': 'zh-TW'}
+OCR_CODES = {code: language for language, code in TRANSLATION_CODES.items()}
+
+
+def detect_script(text):
+    """
+    Sistema de escrita predominante do texto: 'kana', 'hangul', 'han',
+    'thai', 'latin' ou None. Qualquer kana indica japonês (que mistura kanji).
+    """
+    counts = {}
+    for char in text:
+        code = ord(char)
+        if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+            script = 'kana'
+        elif 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+            script = 'hangul'
+        elif 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            script = 'han'
+        elif 0x0E00 <= code <= 0x0E7F:
+            script = 'thai'
+        elif char.isalpha() and code < 0x0250:
+            script = 'latin'
+        else:
+            continue
+        counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return None
+    if 'kana' in counts:
+        return 'kana'
+    return max(counts, key=counts.get)
+
+
+def detect_language(text, candidates, default='en'):
+    """
+    Idioma (código do OCR) provável do texto entre os candidatos, pelo
+    sistema de escrita. Textos em alfabeto latino ficam com o primeiro
+    idioma latino dos candidatos (ou default).
+    """
+    script = detect_script(text)
+    if script in SCRIPT_LANGUAGES:
+        options = SCRIPT_LANGUAGES[script]
+        return next((lang for lang in options if lang in candidates), options[0])
+    if script == 'latin':
+        return next((lang for lang in candidates if lang not in EXCLUSIVE_LANGUAGES), default)
+    return default
+
+
+def translation_code(language):
+    """Código do idioma para o tradutor (ex.: 'ch_sim' -> 'zh-CN')."""
+    return TRANSLATION_CODES.get(language, language)
+
+
+def language_groups(languages):
+    """
+    Divide os idiomas do OCR em grupos que um único leitor consegue carregar
+    (ex.: ['ja', 'ko', 'en'] -> [('ja', 'en'), ('ko', 'en')]).
+    """
+    languages = list(languages)
+    exclusive = [lang for lang in languages if lang in EXCLUSIVE_LANGUAGES]
+    latin = [lang for lang in languages if lang not in EXCLUSIVE_LANGUAGES]
+    groups = [(lang, 'en') for lang in exclusive]
+    if latin and (not groups or latin != ['en']):
+        groups.append(tuple(latin))
+    return groups
+
+
+class ReaderCache:
+    """
+    Leitores de OCR já carregados, por grupo de idiomas, para trocar de
+    idioma sem recarregar modelos. Quando passa de max_readers, ou a memória
+    estimada do processo passa de max_bytes, o leitor usado há mais tempo é
+    descartado. A memória de cada leitor é medida no carregamento (diferença
+    do RSS), porque o RSS quase nunca volta a cair depois de descartar um
+    modelo do torch. Os grupos em `keep` (os do leitor que está lendo) e o
+    recém-carregado nunca são descartados.
+    """
+
+    def __init__(self, factory, max_readers=3, max_bytes=None):
+        self.factory = factory  # factory(grupo) -> motor de OCR carregado
+        self.max_readers = max(1, max_readers)
+        self.max_bytes = max_bytes
+        self._readers = OrderedDict()
+        self.load_times = {}  # grupo -> segundos do último carregamento
+        self.sizes = {}       # grupo -> bytes medidos no último carregamento
+        self._base = None     # RSS do processo antes do primeiro leitor
+        self.evictions = 0
+
+    def get(self, group, keep=()):
+        reader = self._readers.get(group)
+        if reader is not None:
+            self._readers.move_to_end(group)
+            return reader
+
+        protected = set(keep) | {group}
+        while len(self._readers) >= self.max_readers and self._evict(protected):
+            pass
+        before = rss_bytes()
+        if self._base is None:
+            self._base = before or 0
+        started = time.perf_counter()
+        reader = self.factory(group)
+        self.load_times[group] = time.perf_counter() - started
+        after = rss_bytes()
+        self.sizes[group] = max(0, after - before) if before and after else 0
+        self._readers[group] = reader
+
+        # Limite de memória: descarta os mais antigos até a estimativa caber
+        while self.max_bytes and self.estimated_bytes() > self.max_bytes and self._evict(protected):
+            pass
+        return reader
+
+    def estimated_bytes(self):
+        """Memória estimada do processo: antes dos leitores + a medida de cada um carregado."""
+        return (self._base or 0) + sum(self.sizes.get(group, 0) for group in self._readers)
+
+    def _evict(self, protected):
+        """Descarta o leitor usado há mais tempo fora de protected (False se não houver)."""
+        group = next((group for group in self._readers if group not in protected), None)
+        if group is None:
+            return False
+        del self._readers[group]
+        self.evictions += 1
+        gc.collect()  # Libera os tensores do modelo antes do próximo carregamento
+        print(f"OCR: leitor {'+'.join(group)} descartado (limite de leitores ou memória)")
+        return True
+
+    def loaded(self):
+        return list(self._readers)
+
+
+class MultiLanguageReader:
+    """
+    Motor de OCR (mesma interface de ocr_backends) para vários grupos de
+    idiomas. Com um grupo, só repassa para o leitor dele. Com vários, lê o
+    quadro com o leitor principal e, nas regiões em outro sistema de escrita
+    ou com confiança baixa, reconhece de novo o recorte com os leitores dos
+    outros grupos, ficando com o melhor resultado. O principal passa a ser o
+    grupo que venceu mais regiões na escrita própria dele (textos latinos
+    todos leem), então um jogo em coreano logo deixa de pagar a leitura dupla.
+    """
+
+    def __init__(self, cache, groups, min_confidence=0.6, padding=4):
+        self.cache = cache
+        self.groups = [tuple(group) for group in groups]
+        self.languages = [lang for group in self.groups for lang in group]
+        self.min_confidence = min_confidence
+        self.padding = padding
+        self._primary = self.groups[0]
+        self.rerecognized = 0
+
+    def _group_of(self, text, preferred):
+        """Grupo do idioma detectado no texto (o preferido, se ele também servir)."""
+        language = detect_language(text, self.languages)
+        if language in preferred:
+            return preferred
+        return next((group for group in self.groups if language in group), None)
+
+    @staticmethod
+    def _is_specific(text):
+        """Texto em uma escrita que só um dos grupos lê (não latina)."""
+        return detect_script(text) in SCRIPT_LANGUAGES
+
+    def readtext(self, image):
+        if len(self.groups) == 1:
+            return self.cache.get(self._primary, self.groups).readtext(image)
+
+        primary = self._primary
+        results = []
+        wins = {}
+        for result in self.cache.get(primary, self.groups).readtext(image):
+            group = self._group_of(result.text, primary)
+            if group == primary and result.confidence >= self.min_confidence:
+                results.append(result)
+                if self._is_specific(result.text):
+                    wins[primary] = wins.get(primary, 0) + 1
+                continue
+
+            # Outro sistema de escrita (ou leitura duvidosa): tenta os outros
+            # leitores no recorte, começando pelo do idioma detectado
+            others = [g for g in self.groups if g != primary]
+            if group in others:
+                others.remove(group)
+                others.insert(0, group)
+            best, best_group = result, primary
+            for other in others:
+                candidate = self._recognize_crop(other, image, result)
+                if candidate is not None and self._group_of(candidate.text, other) == other \
+                        and candidate.confidence > best.confidence:
+                    best, best_group = candidate, other
+                if best.confidence >= self.min_confidence and best_group == group:
+                    break
+            self.rerecognized += 1
+            results.append(best)
+            if self._is_specific(best.text):
+                wins[best_group] = wins.get(best_group, 0) + 1
+
+        if wins:
+            self._primary = max(wins, key=lambda g: (wins[g], g == primary))
+        return results
+
+    def _recognize_crop(self, group, image, result):
+        """Reconhece só a caixa de um resultado com o leitor de outro grupo."""
+        xs = [pt[0] for pt in result.box]
+        ys = [pt[1] for pt in result.box]
+        h, w = image.shape[:2]
+        x1, y1 = max(0, min(xs) - self.padding), max(0, min(ys) - self.padding)
+        x2, y2 = min(w, max(xs) + self.padding), min(h, max(ys) + self.padding)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        found = self.cache.get(group, self.groups).readtext(image[y1:y2, x1:x2])
+        if not found:
+            return None
+        text = ' '.join(res.text for res in found)
+        confidence = sum(res.confidence for res in found) / len(found)
+        return OCRResult(result.box, text, confidence)
@@ -0,0 +1,183 @@
+from collections import namedtuple
+
+# Resultado normalizado de todos os motores de OCR.
+# box: 4 pontos [x, y] (sentido horário a partir do canto superior esquerdo)
+OCRResult = namedtuple('OCRResult', ['box', 'text', 'confidence'])
+
+# Códigos de idioma do EasyOCR -> Tesseract
+TESSERACT_LANGUAGES = {
+    'en': 'eng', 'pt': 'por', 'es': 'spa', 'fr': 'fra', 'de': 'deu', 'it': 'ita',
+    'ja': 'jpn', 'ko': 'kor', 'ch_sim': 'chi_sim', 'ch_tra': 'chi_tra', 'ru': 'rus',
+}
+
+
+def _rect_box(x1, y1, x2, y2):
+    """Converte um retângulo em 4 pontos."""
+    return [[int(x1), int(y1)], [int(x2), int(y1)], [int(x2), int(y2)], [int(x1), int(y2)]]
+
+
+def merge_lines(results, x_ths=1.0, y_ths=0.5):
+    """
+    Une linhas vizinhas em parágrafos, como o paragraph=True do EasyOCR, mas
+    mantendo a confiança (média das linhas ponderada pelo tamanho do texto;
+    o EasyOCR descarta a confiança ao montar parágrafos). Duas linhas ficam
+    no mesmo parágrafo quando a distância vertical e a horizontal entre elas
+    são menores que y_ths e x_ths vezes a altura da linha menor.
+    """
+    lines = []
+    for box, text, confidence in results:
+        xs = [pt[0] for pt in box]
+        ys = [pt[1] for pt in box]
+        lines.append((min(xs), min(ys), max(xs), max(ys), text, confidence))
+
+    # União dos grupos (union-find) das linhas próximas
+    parent = list(range(len(lines)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, (ax1, ay1, ax2, ay2, _, _) in enumerate(lines):
+        for j in range(i + 1, len(lines)):
+            bx1, by1, bx2, by2, _, _ = lines[j]
+            height = max(1, min(ay2 - ay1, by2 - by1))
+            if max(ay1, by1) - min(ay2, by2) <= y_ths * height and \
+                    max(ax1, bx1) - min(ax2, bx2) <= x_ths * height:
+                parent[root(j)] = root(i)
+
+    groups = {}
+    for i in range(len(lines)):
+        groups.setdefault(root(i), []).append(lines[i])
+
+    merged = []
+    for group in groups.values():
+        # Ordem de leitura: por linha (centro vertical) e, na linha, da esquerda para a direita
+        height = max(1, sum(y2 - y1 for _, y1, _, y2, _, _ in group) / len(group))
+        group.sort(key=lambda line: (round((line[1] + line[3]) / 2 / height), line[0]))
+        text = ' '.join(line[4] for line in group)
+        weights = [max(1, len(line[4])) for line in group]
+        confidence = sum(w * line[5] for w, line in zip(weights, group)) / sum(weights)
+        merged.append(OCRResult(
+            _rect_box(min(line[0] for line in group), min(line[1] for line in group),
+                      max(line[2] for line in group), max(line[3] for line in group)),
+            text, float(confidence)))
+    # Parágrafos de cima para baixo, como o EasyOCR
+    merged.sort(key=lambda result: (result.box[0][1], result.box[0][0]))
+    return merged
+
+
+class EasyOCRBackend:
+    """
+    EasyOCR (PyTorch), com detecção e reconhecimento separados (StagedReader).
+    O reconhecimento é feito por linha (com confiança) e as linhas são unidas
+    em parágrafos por merge_lines.
+    """
+
+    name = 'easyocr'
+
+    def __init__(self, languages=('en',), gpu=False, threads=None, paragraph=True):
+        import easyocr
+        from staged_ocr import StagedReader
+
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+
+        self.reader = easyocr.Reader(list(languages), gpu=gpu)
+        self.staged = StagedReader(self.reader)
+        self.paragraph = paragraph
+
+    def readtext(self, image):
+        results = []
+        # Sempre por linha: com paragraph=True o EasyOCR não retorna a confiança
+        for res in self.staged.readtext(image, detail=1, paragraph=False):
+            if len(res) == 3:
+                box, text, confidence = res
+            elif len(res) == 2:
+                box, text = res
+                confidence = 1.0  # Assume confiança máxima
+            else:
+                continue
+            results.append(OCRResult(
+                [[int(x), int(y)] for x, y in box], text, float(confidence)))
+        return merge_lines(results) if self.paragraph else results
+
+
+class TesseractBackend:
+    """Tesseract via pytesseract: leve e rápido em CPU para textos limpos de interface."""
+
+    name = 'tesseract'
+
+    def __init__(self, languages=('en',), gpu=False, threads=None, paragraph=True):
+        import pytesseract
+
+        self.pytesseract = pytesseract
+        self.lang = '+'.join(TESSERACT_LANGUAGES.get(lang, lang) for lang in languages)
+        self.paragraph = paragraph
+        # Confirma que o executável do Tesseract está instalado
+        pytesseract.get_tesseract_version()
+
+    def readtext(self, image):
+        data = self.pytesseract.image_to_data(
+            image, lang=self.lang, output_type=self.pytesseract.Output.DICT)
+
+        # Agrupa as palavras por parágrafo (ou por linha)
+        groups = {}
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if confidence < 0 or not word.strip():
+                continue
+            key = (data['block_num'][i], data['par_num'][i])
+            if not self.paragraph:
+                key += (data['line_num'][i],)
+            groups.setdefault(key, []).append(i)
+
+        results = []
+        for indices in groups.values():
+            x1 = min(data['left'][i] for i in indices)
+            y1 = min(data['top'][i] for i in indices)
+            x2 = max(data['left'][i] + data['width'][i] for i in indices)
+            y2 = max(data['top'][i] + data['height'][i] for i in indices)
+            text = ' '.join(data['text'][i].strip() for i in indices)
+            confidence = sum(float(data['conf'][i]) for i in indices) / len(indices) / 100
+            results.append(OCRResult(_rect_box(x1, y1, x2, y2), text, confidence))
+        return results
+
+
+class RapidOCRBackend:
+    """PaddleOCR convertido para ONNX Runtime (rapidocr_onnxruntime), sem PyTorch."""
+
+    name = 'rapidocr'
+
+    def __init__(self, languages=('en',), gpu=False, threads=None, paragraph=True):
+        from rapidocr_onnxruntime import RapidOCR
+
+        # Os modelos padrão reconhecem chinês e inglês
+        if set(languages) - {'en', 'ch_sim'}:
+            print(f"Aviso: RapidOCR usa os modelos padrão (chinês/inglês); "
+                  f"idiomas ignorados: {languages}")
+        kwargs = {'intra_op_num_threads': threads} if threads else {}
+        self.engine = RapidOCR(**kwargs)
+
+    def readtext(self, image):
+        result, _ = self.engine(image)
+        return [OCRResult([[int(x), int(y)] for x, y in box], text, float(score))
+                for box, text, score in result or []]
+
+
+# Motores disponíveis, selecionáveis por nome
+BACKENDS = {
+    EasyOCRBackend.name: EasyOCRBackend,
+    TesseractBackend.name: TesseractBackend,
+    RapidOCRBackend.name: RapidOCRBackend,
+}
+
+
+def create_backend(name, languages=('en',), gpu=False, threads=None):
+    """Cria o motor de OCR pelo nome ('easyocr', 'tesseract' ou 'rapidocr')."""
+    if name not in BACKENDS:
+        raise ValueError(f"Motor de OCR desconhecido: {name} "
+                         f"(disponíveis: {', '.join(BACKENDS)})")
+    return BACKENDS[name](languages=languages, gpu=gpu, threads=threads)
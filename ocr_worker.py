@@ -0,0 +1,299 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _worker_main(requests, responses, backend_name, languages, gpu, threads, preprocess,
+                 max_readers=3, max_memory_mb=None):
+    """
+    Laço do processo de OCR: carrega os modelos sob demanda (um leitor por
+    grupo de idiomas, em cache LRU) e atende os pedidos.
+    """
+    # Suprime avisos específicos do torch
+    warnings.filterwarnings("ignore", message=".*'pin_memory'.*")
+
+    times = {}
+    try:
+        started = time.perf_counter()
+        import cv2
+        from incremental_ocr import IncrementalOCR
+        from multilang_ocr import MultiLanguageReader, ReaderCache, language_groups
+        from ocr_backends import create_backend
+        from preprocess import Preprocessor
+        times['import'] = time.perf_counter() - started
+
+        # Imagem para a inferência de aquecimento: a primeira chamada de
+        # detecção e de reconhecimento é bem mais lenta, então paga esse custo
+        # ao carregar
+        dummy = np.full((64, 320, 3), 255, dtype=np.uint8)
+        cv2.putText(dummy, 'GhostText', (10, 45), cv2.FONT_HERSHEY_SIMPLEX,
+                    1.2, (0, 0, 0), 2)
+
+        def load_reader(group):
+            started = time.perf_counter()
+            backend = create_backend(backend_name, group, gpu=gpu, threads=threads)
+            times['model_load'] = time.perf_counter() - started
+            started = time.perf_counter()
+            backend.readtext(dummy)
+            times['warmup'] = time.perf_counter() - started
+            return backend
+
+        readers = ReaderCache(load_reader, max_readers=max_readers,
+                              max_bytes=max_memory_mb * 1024 * 1024 if max_memory_mb else None)
+
+        engines = OrderedDict()  # grupos de idiomas -> OCR incremental
+
+        def engine_for(groups):
+            """OCR incremental (com pré-processamento) de uma combinação de idiomas."""
+            engine = engines.get(groups)
+            if engine is None:
+                backend = MultiLanguageReader(readers, groups)
+                # Pré-processamento (recorte, escala e contraste) antes do motor
+                if preprocess is not None:
+                    backend = Preprocessor(backend, **preprocess)
+                engine = engines[groups] = IncrementalOCR(backend)
+                while len(engines) > 8:
+                    engines.popitem(last=False)
+            engines.move_to_end(groups)
+            return engine
+
+        default_groups = tuple(language_groups(languages))
+        readers.get(default_groups[0])
+    except Exception as e:
+        responses.put((None, 'error', f"Falha ao carregar o OCR ({backend_name}): {e}"))
+        return
+    responses.put((None, 'ready', dict(times)))
+
+    attached = {}
+    while True:
+        # Pega todos os pedidos acumulados e mantém só o mais recente por área
+        batch = [requests.get()]
+        while True:
+            try:
+                batch.append(requests.get_nowait())
+            except queue.Empty:
+                break
+
+        latest = {}
+        stop = False
+        for request in batch:
+            if request is None:
+                stop = True
+                continue
+            request_id, key = request[0], request[1]
+            slot_key = ('area', key) if key is not None else ('id', request_id)
+            if slot_key in latest:
+                responses.put((latest[slot_key][0], 'superseded', None))
+            latest[slot_key] = request
+
+        for request_id, key, shm_name, shape, dtype, request_languages in latest.values():
+            if stop:
+                responses.put((request_id, 'superseded', None))
+                continue
+            try:
+                if shm_name not in attached:
+                    attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+                    # Blocos antigos (substituídos por maiores) deixam de ser usados
+                    while len(attached) > 16:
+                        attached.pop(next(iter(attached))).close()
+                image = np.ndarray(shape, dtype=dtype, buffer=attached[shm_name].buf)
+                groups = tuple(language_groups(request_languages)) if request_languages \
+                    else default_groups
+                results = engine_for(groups).readtext(image, key=key)
+                del image
+                responses.put((request_id, 'ok', results))
+            except Exception as e:
+                responses.put((request_id, 'error', str(e)))
+
+        if stop:
+            for shm in attached.values():
+                shm.close()
+            return
+
+
+class _Slot:
+    """Bloco de memória compartilhada reutilizado para enviar quadros ao worker."""
+
+    def __init__(self):
+        self.shm = None
+
+    def ensure(self, nbytes):
+        if self.shm is None or self.shm.size < nbytes:
+            self.release()
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+
+    def release(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class OCRWorker:
+    """
+    Executa o OCR em processo(s) separado(s), fora do GIL da interface.
+
+    O motor de OCR (ver ocr_backends) é carregado uma única vez por processo
+    e por grupo de idiomas (até max_readers leitores em cache, ou até a
+    memória estimada do processo passar de max_memory_mb; ver
+    multilang_ocr.ReaderCache), com
+    pré-processamento (ver preprocess; preprocess=None desativa) e OCR
+    incremental por cima. Os quadros são copiados para blocos de memória
+    compartilhada (sem pickle da imagem) e só o pedido mais recente de cada
+    área é processado: pedidos substituídos retornam None. A interface de
+    readtext é a mesma do IncrementalOCR.
+    """
+
+    def __init__(self, backend='easyocr', languages=('en',), gpu=False, num_workers=1, slots=4,
+                 preprocess=None, max_readers=3, max_memory_mb=None):
+        self.backend = backend
+        ctx = mp.get_context('spawn')
+        self._responses = ctx.Queue()
+        self._workers = []
+        threads = max(1, (os.cpu_count() or 1) // num_workers)
+        for _ in range(num_workers):
+            requests = ctx.Queue()
+            process = ctx.Process(
+                target=_worker_main, name='ghosttext-ocr', daemon=True,
+                args=(requests, self._responses, backend, tuple(languages), gpu, threads,
+                      preprocess, max_readers, max_memory_mb))
+            process.start()
+            self._workers.append((process, requests))
+
+        self._slots = queue.Queue()
+        self._all_slots = [_Slot() for _ in range(slots)]
+        for slot in self._all_slots:
+            self._slots.put(slot)
+
+        self._ids = itertools.count()
+        self._round_robin = itertools.count()
+        self._pending = {}  # id do pedido -> (Future, slot)
+        self._lock = threading.Lock()
+        self._ready_count = 0
+        self.ready = threading.Event()  # Sinalizado quando o carregamento termina
+        self.load_times = {}  # Tempos de carregamento informados pelos workers
+        self.error = None
+        self._closed = False
+
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    def readtext(self, image, key=None, timeout=None, languages=None):
+        """
+        Envia o quadro ao worker e espera o resultado (None se foi substituído).
+        languages troca os idiomas só deste pedido (o leitor é carregado na
+        primeira vez e fica em cache); None usa os idiomas do worker.
+        """
+        if self.error:
+            raise RuntimeError(self.error)
+        if self._closed:
+            return None
+
+        image = np.ascontiguousarray(image)
+        slot = self._slots.get()
+        try:
+            slot.ensure(image.nbytes)
+            np.ndarray(image.shape, dtype=image.dtype, buffer=slot.shm.buf)[:] = image
+
+            future = Future()
+            with self._lock:
+                if self._closed:
+                    # Encerrado (ex.: troca de motor): o pedido é substituído
+                    slot.release()
+                    self._slots.put(slot)
+                    return None
+                request_id = next(self._ids)
+                self._pending[request_id] = (future, slot)
+
+            # A mesma área vai sempre para o mesmo worker (aproveita os caches dele)
+            if key is not None:
+                index = hash(key) % len(self._workers)
+            else:
+                index = next(self._round_robin) % len(self._workers)
+            self._workers[index][1].put(
+                (request_id, key, slot.shm.name, image.shape, image.dtype.str,
+                 tuple(languages) if languages else None))
+        except Exception:
+            self._slots.put(slot)
+            raise
+
+        status, payload = future.result(timeout)
+        if status == 'error':
+            raise RuntimeError(payload)
+        return payload if status == 'ok' else None
+
+    def _collect(self):
+        """Recebe as respostas dos workers e libera os blocos de memória."""
+        while not self._closed:
+            try:
+                request_id, status, payload = self._responses.get(timeout=1.0)
+            except queue.Empty:
+                if any(not process.is_alive() for process, _ in self._workers):
+                    self._fail_all("Processo de OCR encerrado inesperadamente")
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            if request_id is None:
+                if status == 'ready':
+                    # Com vários workers, guarda o tempo do mais lento
+                    for stage, seconds in payload.items():
+                        self.load_times[stage] = max(seconds, self.load_times.get(stage, 0.0))
+                    self._ready_count += 1
+                    if self._ready_count == len(self._workers):
+                        self.ready.set()
+                else:
+                    self._fail_all(payload)
+                continue
+
+            with self._lock:
+                future, slot = self._pending.pop(request_id, (None, None))
+            if slot is not None:
+                self._slots.put(slot)
+            if future is not None:
+                future.set_result((status, payload))
+
+    def _fail_all(self, message):
+        """Marca o worker como indisponível e encerra os pedidos pendentes."""
+        self.error = message
+        print(f"Erro no OCR: {message}")
+        # O carregamento terminou (com erro): libera quem está esperando
+        self.ready.set()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, slot in pending.values():
+            self._slots.put(slot)
+            future.set_result(('error', message))
+
+    def close(self):
+        """
+        Encerra os processos de OCR e libera a memória compartilhada. Pedidos
+        pendentes (e os feitos depois) retornam None, como substituídos.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for process, requests in self._workers:
+            requests.put(None)
+        for process, _ in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        # O coletor já parou: pedidos ainda em andamento retornam como substituídos
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, slot in pending.values():
+            self._slots.put(slot)
+            future.set_result(('superseded', None))
+        for slot in self._all_slots:
+            slot.release()
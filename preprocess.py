@@ -0,0 +1,144 @@
+import numpy as np
+
+from ocr_backends import OCRResult
+
+
+class Preprocessor:
+    """
+    Etapa de pré-processamento entre o OCR incremental e o motor de OCR.
+
+    1. Propõe áreas com texto (gradiente morfológico + limiar de Otsu) e
+       recorta o resto (céu, cenário, interface vazia).
+    2. Reduz cada recorte para que as linhas de texto fiquem com cerca de
+       target_text_height pixels (nunca amplia).
+    3. Converte para escala de cinza e normaliza o contraste.
+
+    As caixas retornadas pelo motor voltam para as coordenadas da imagem
+    recebida, então o resto do pipeline não percebe o pré-processamento.
+    """
+
+    def __init__(self, backend, grayscale=True, contrast='minmax', target_text_height=24,
+                 min_scale=0.25, crop_to_text=True, max_crops=8, padding=8,
+                 min_edge_coverage=0.5):
+        self.backend = backend
+        self.grayscale = grayscale
+        self.contrast = contrast              # 'minmax', 'clahe' ou None
+        self.target_text_height = target_text_height
+        self.min_scale = min_scale
+        self.crop_to_text = crop_to_text
+        self.max_crops = max_crops
+        self.padding = padding
+        self.min_edge_coverage = min_edge_coverage  # Fração das bordas que os recortes devem conter
+
+        # Contadores: proporção de pixels enviados ao motor
+        self.pixels_in = 0
+        self.pixels_out = 0
+
+    def readtext(self, image):
+        import cv2
+
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        h, w = gray.shape
+        self.pixels_in += h * w
+
+        crops, line_height = self._propose(gray) if self.crop_to_text else ([], None)
+        if not crops:
+            # Sem propostas confiáveis: o motor lê a imagem inteira, para
+            # nenhum texto sumir por causa do recorte
+            crops, line_height = [(0, 0, w, h)], None
+
+        results = []
+        for x1, y1, x2, y2 in crops:
+            crop = gray[y1:y2, x1:x2] if self.grayscale else image[y1:y2, x1:x2]
+
+            sx = sy = 1.0
+            if line_height and line_height > self.target_text_height:
+                scale = max(self.min_scale, self.target_text_height / line_height)
+                ch, cw = crop.shape[:2]
+                new_w, new_h = max(1, int(cw * scale)), max(1, int(ch * scale))
+                crop = cv2.resize(crop, (new_w, new_h), interpolation=cv2.INTER_AREA)
+                sx, sy = new_w / cw, new_h / ch
+
+            if self.grayscale and self.contrast == 'minmax':
+                crop = cv2.normalize(crop, None, 0, 255, cv2.NORM_MINMAX)
+            elif self.grayscale and self.contrast == 'clahe':
+                crop = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(crop)
+
+            self.pixels_out += crop.shape[0] * crop.shape[1]
+            for box, text, confidence in self.backend.readtext(crop):
+                # Volta para as coordenadas da imagem original
+                mapped = [[int(round(px / sx)) + x1, int(round(py / sy)) + y1]
+                          for px, py in box]
+                results.append(OCRResult(mapped, text, confidence))
+        return results
+
+    def _propose(self, gray):
+        """
+        Retorna os recortes (x1, y1, x2, y2) com provável texto e a altura
+        típica das linhas (mediana), usada para a redução de escala. Retorna
+        uma lista vazia (imagem inteira) quando não acha linhas ou quando os
+        recortes deixariam de fora boa parte das bordas da imagem.
+        """
+        import cv2
+
+        h, w = gray.shape
+        # Bordas de caracteres têm gradiente forte; fundos lisos não
+        gradient = cv2.morphologyEx(
+            gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+        _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+        # Une os caracteres em linhas
+        lines = cv2.morphologyEx(
+            mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3)))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(lines)
+        line_boxes = [(x, y, bw, bh) for x, y, bw, bh, area in stats[1:]
+                      if bh >= 6 and bw >= 8 and self._is_filled(lines, x, y, bw, bh, area)]
+        if not line_boxes:
+            return [], None
+        line_height = float(np.median([bh for _, _, _, bh in line_boxes]))
+
+        # Une linhas próximas em blocos (mantém parágrafos inteiros)
+        blocks_mask = np.zeros((h, w), dtype=np.uint8)
+        for x, y, bw, bh in line_boxes:
+            blocks_mask[y:y + bh, x:x + bw] = 255
+        gap = max(3, int(line_height))
+        blocks_mask = cv2.dilate(
+            blocks_mask, cv2.getStructuringElement(cv2.MORPH_RECT, (2 * gap, gap)))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(blocks_mask)
+
+        p = self.padding
+        crops = [(max(0, int(x) - p), max(0, int(y) - p),
+                  min(w, int(x + bw) + p), min(h, int(y + bh) + p))
+                 for x, y, bw, bh, _ in stats[1:]]
+
+        # Recortes que deixam de fora a maior parte das bordas (texto que não
+        # formou linhas): melhor ler a imagem inteira
+        inside = sum(cv2.countNonZero(mask[y1:y2, x1:x2]) for x1, y1, x2, y2 in crops)
+        if inside < self.min_edge_coverage * cv2.countNonZero(mask):
+            return [], None
+
+        covered = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in crops)
+        if len(crops) > self.max_crops or covered > 0.6 * h * w:
+            # Muitos blocos (ou quase a tela toda): um único recorte envolvendo todos
+            crops = [(min(c[0] for c in crops), min(c[1] for c in crops),
+                      max(c[2] for c in crops), max(c[3] for c in crops))]
+        return crops, line_height
+
+    @staticmethod
+    def _is_filled(lines, x, y, bw, bh, area):
+        """
+        Se o componente parece uma linha de texto (e não um traço solto):
+        preenche boa parte da própria caixa. Letras grandes têm só o contorno
+        marcado pelo gradiente, então o preenchimento é medido de novo na
+        máscara dilatada proporcionalmente à altura.
+        """
+        import cv2
+
+        if area >= 0.3 * bw * bh:
+            return True
+        if bh < 16 or bh > 200:
+            return False  # Pequeno demais para ser contorno, ou alto demais (painéis, bordas)
+        size = bh // 4
+        dilated = cv2.dilate(lines[y:y + bh, x:x + bw],
+                             cv2.getStructuringElement(cv2.MORPH_RECT, (size, size)))
+        return cv2.countNonZero(dilated) >= 0.6 * bw * bh
@@ -0,0 +1,150 @@
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PatchStore:
+    """
+    Guarda os trechos borrados das regiões uma única vez, em cópia compacta:
+    o blur é suave, então o trecho é guardado reduzido (scale) e ampliado de
+    novo só quando o overlay precisa ser remontado (mudança de fonte ou de
+    tradução). Acima de max_bytes os trechos usados há mais tempo são
+    descartados; um trecho descartado é refeito com a cor média da caixa.
+
+    Os trechos nunca são views do quadro borrado: uma view manteria o
+    quadro inteiro na memória enquanto a região existisse.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, scale=4):
+        self.max_bytes = max_bytes
+        self.scale = scale
+        self._pixels = OrderedDict()  # id -> trecho reduzido (LRU)
+        self._info = {}               # id -> (altura, largura, cor média)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+        # Contadores (ver stats)
+        self.bytes = 0
+        self.evictions = 0
+        self.regenerated = 0
+
+    def put(self, patch, scale=None):
+        """Guarda um trecho (H x W x 3) e retorna o id dele."""
+        import cv2
+
+        scale = scale or self.scale
+        h, w = patch.shape[:2]
+        pixels = None
+        if patch.size == 0:
+            color = np.zeros(3, dtype=np.uint8)
+        elif patch.strides[0] == 0:
+            # Cor constante (blur 'mean'): só a cor é guardada
+            color = np.array(patch[0, 0], dtype=np.uint8)
+        else:
+            if scale > 1 and h >= 2 * scale and w >= 2 * scale:
+                pixels = cv2.resize(patch, (w // scale, h // scale), interpolation=cv2.INTER_AREA)
+            else:
+                pixels = patch.copy()
+            color = pixels.reshape(-1, 3).mean(axis=0).astype(np.uint8)
+
+        with self._lock:
+            patch_id = next(self._ids)
+            self._info[patch_id] = (h, w, color)
+            if pixels is not None:
+                self._pixels[patch_id] = pixels
+                self.bytes += pixels.nbytes
+                self._evict()
+        return patch_id
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and self._pixels:
+            _, pixels = self._pixels.popitem(last=False)
+            self.bytes -= pixels.nbytes
+            self.evictions += 1
+
+    def get(self, patch_id):
+        """Trecho no tamanho original (refeito a partir da cópia compacta), ou None."""
+        import cv2
+
+        with self._lock:
+            info = self._info.get(patch_id)
+            if info is None:
+                return None
+            h, w, color = info
+            pixels = self._pixels.get(patch_id)
+            if pixels is not None:
+                self._pixels.move_to_end(patch_id)
+            else:
+                self.regenerated += 1
+        if pixels is None:
+            return np.broadcast_to(color, (h, w, 3))
+        if pixels.shape[:2] == (h, w):
+            return pixels
+        return cv2.resize(pixels, (w, h), interpolation=cv2.INTER_LINEAR)
+
+    def release(self, patch_id):
+        """Descarta o trecho (chamado quando a região deixa de existir)."""
+        with self._lock:
+            self._info.pop(patch_id, None)
+            pixels = self._pixels.pop(patch_id, None)
+            if pixels is not None:
+                self.bytes -= pixels.nbytes
+
+    def stats(self):
+        with self._lock:
+            return {'patches': len(self._info), 'patch_bytes': self.bytes,
+                    'patches_evicted': self.evictions, 'patches_regenerated': self.regenerated}
+
+
+class Region:
+    """
+    Região traduzida, em registro compacto (__slots__) que também aceita o
+    acesso de dicionário usado no resto do código (region['bbox'],
+    region.get('overlay_item')). Os textos não são internados (strings
+    internadas nunca seriam liberadas em uma sessão longa); o blur fica no
+    PatchStore, que o libera quando a região é descartada.
+    """
+
+    __slots__ = ('bbox', 'orig_text', 'translation', 'text_color', 'outline_color',
+                 'blur_key', 'overlay_item', 'overlay_img', 'render_key', '_store', '__weakref__')
+
+    def __init__(self, bbox, orig_text, translation, text_color=None, outline_color=None,
+                 blur_patch=None, store=None, scale=None):
+        self.bbox = tuple(int(v) for v in bbox)
+        self.orig_text = orig_text
+        self.translation = translation
+        self.text_color = text_color
+        self.outline_color = outline_color
+        self.overlay_item = None
+        self.overlay_img = None
+        self.render_key = None
+        self._store = store
+        self.blur_key = None
+        if blur_patch is not None and store is not None:
+            self.blur_key = store.put(blur_patch, scale)
+            weakref.finalize(self, store.release, self.blur_key)
+
+    @property
+    def blur_patch(self):
+        """Trecho borrado (refeito pelo PatchStore a cada acesso; None sem blur)."""
+        if self.blur_key is None:
+            return None
+        return self._store.get(self.blur_key)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return f"Region({self.bbox}, {self.orig_text!r} -> {self.translation!r})"
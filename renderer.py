@@ -0,0 +1,150 @@
+import tkinter as tk
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+# Fontes tentadas em ordem (Windows, Linux)
+FONT_CANDIDATES = ('arial.ttf', 'Arial.ttf', 'DejaVuSans.ttf', 'LiberationSans-Regular.ttf')
+
+
+class OverlayRenderer:
+    """
+    Desenha cada região como uma única imagem no Canvas: o blur e o texto
+    traduzido com contorno (ImageDraw.text com stroke_width) são compostos em
+    uma imagem só, em vez de uma imagem e nove itens de texto do Tk.
+    Regiões inalteradas não são redesenhadas; as alteradas são atualizadas
+    no mesmo item do Canvas.
+    """
+
+    def __init__(self, canvas, font_family='Arial', padding=2, stroke_width=1):
+        self.canvas = canvas
+        self.font_family = font_family
+        self.padding = padding
+        self.stroke_width = stroke_width
+        self._fonts = {}
+        # Tamanho de fonte em pontos (como no Tk) -> pixels
+        # Sem Canvas (benchmark, modo em lote) assume 96 DPI
+        self._points_to_pixels = canvas.winfo_fpixels('1p') if canvas is not None else 96 / 72
+
+    def _font(self, size):
+        """Carrega (uma vez por tamanho) a fonte usada nos overlays."""
+        if size not in self._fonts:
+            pixels = max(1, round(size * self._points_to_pixels))
+            font = None
+            for name in FONT_CANDIDATES:
+                try:
+                    font = ImageFont.truetype(name, pixels)
+                    break
+                except OSError:
+                    continue
+            self._fonts[size] = font or ImageFont.load_default(pixels)
+        return self._fonts[size]
+
+    @staticmethod
+    def _wrap(text, font, max_width):
+        """Quebra o texto em linhas que cabem na largura (como o width= do Tk)."""
+        lines = []
+        for paragraph in text.split('\n'):
+            line = ''
+            for word in paragraph.split(' '):
+                candidate = f"{line} {word}" if line else word
+                if line and font.getlength(candidate) > max_width:
+                    lines.append(line)
+                    line = word
+                else:
+                    line = candidate
+            lines.append(line)
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _opaque(color):
+        """Evita preto puro: a cor preta é transparente na janela da HUD."""
+        return '#010101' if color.lower() == '#000000' else color
+
+    def compose(self, region, font_size):
+        """Monta a imagem da região: blur de fundo + texto traduzido com contorno."""
+        _, _, w, h = region['bbox']
+        font = self._font(font_size)
+        text = self._wrap(region['translation'], font, max(1, w - 2 * self.padding))
+
+        # A imagem cresce para baixo se o texto traduzido for maior que a caixa
+        draw_probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        left, top, right, bottom = draw_probe.multiline_textbbox(
+            (self.padding, self.padding), text, font=font, stroke_width=self.stroke_width)
+        height = max(h, int(bottom) + self.padding)
+
+        image = Image.new('RGBA', (max(1, w), max(1, height)), (0, 0, 0, 0))
+        patch = region['blur_patch']
+        if patch is not None and patch.size:
+            image.paste(Image.fromarray(np.ascontiguousarray(patch)).convert('RGBA'), (0, 0))
+        draw = ImageDraw.Draw(image)
+        draw.multiline_text(
+            (self.padding, self.padding), text, font=font,
+            fill=self._opaque(region['text_color']),
+            stroke_width=self.stroke_width,
+            stroke_fill=self._opaque(region['outline_color']))
+        return image
+
+    @staticmethod
+    def render_key(region, font_size):
+        """Tudo o que muda a imagem da região (se não mudou, nada é redesenhado)."""
+        # Regiões do engine identificam o blur pelo id no PatchStore (o trecho
+        # é refeito a cada acesso); dicionários simples, pelo próprio array
+        blur_key = region.get('blur_key') or id(region['blur_patch'])
+        return (region['translation'], font_size, region['text_color'],
+                region['outline_color'], blur_key)
+
+    def needs_draw(self, region, font_size):
+        return not (region.get('render_key') == self.render_key(region, font_size)
+                    and region.get('overlay_item'))
+
+    def draw(self, region, font_size, image=None):
+        """
+        Cria ou atualiza o item da região; não faz nada se ela não mudou.
+        image: imagem já composta (compose) fora do mainloop, se houver.
+        Deve ser chamado na thread do Tk.
+        """
+        if not self.needs_draw(region, font_size):
+            return
+
+        if image is None:
+            image = self.compose(region, font_size)
+
+        x_abs, y_abs, _, _ = region['bbox']
+        photo = region.get('overlay_img')
+        item = region.get('overlay_item')
+
+        if item and photo is not None and (photo.width(), photo.height()) == image.size:
+            # Mesmo tamanho: atualiza os pixels da imagem já exibida
+            photo.paste(image)
+        elif item:
+            photo = ImageTk.PhotoImage(image)
+            self.canvas.itemconfig(item, image=photo)
+        else:
+            photo = ImageTk.PhotoImage(image)
+            item = self.canvas.create_image(
+                x_abs, y_abs, anchor=tk.NW, image=photo, tags="overlay")
+
+        # Mantém a referência da imagem (senão o Tk a descarta)
+        region['overlay_img'] = photo
+        region['overlay_item'] = item
+        region['render_key'] = self.render_key(region, font_size)
+
+    def remove(self, region):
+        """Remove a região do Canvas."""
+        if region.get('overlay_item'):
+            self.canvas.delete(region['overlay_item'])
+        region['overlay_item'] = None
+        region['overlay_img'] = None
+        region['render_key'] = None
+
+    def hide_all(self):
+        """Esconde os overlays sem descartá-los (ex.: durante uma captura)."""
+        self.canvas.itemconfigure("overlay", state=tk.HIDDEN)
+
+    def show_all(self):
+        self.canvas.itemconfigure("overlay", state=tk.NORMAL)
+
+    def clear(self):
+        """Remove todos os overlays do Canvas."""
+        self.canvas.delete("overlay")
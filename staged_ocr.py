@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+import numpy as np
+import cv2
+
+# Parâmetros do readtext que pertencem à etapa de detecção (CRAFT)
+DETECT_PARAMS = {
+    'min_size', 'text_threshold', 'low_text', 'link_threshold', 'canvas_size',
+    'mag_ratio', 'slope_ths', 'ycenter_ths', 'height_ths', 'width_ths',
+    'add_margin', 'optimal_num_chars', 'threshold', 'bbox_min_score',
+    'bbox_min_size', 'max_candidates',
+}
+
+
+class StagedReader:
+    """
+    Separa o readtext do EasyOCR em detecção (Reader.detect) e reconhecimento
+    (Reader.recognize). As caixas detectadas ficam em cache por formato da
+    imagem e são reaproveitadas enquanto o layout não muda: se só o conteúdo
+    dentro das caixas mudou (ex.: nova fala na mesma caixa de diálogo), apenas
+    o reconhecimento roda. A detecção é refeita quando algo muda fora das
+    caixas ou após max_reuse reaproveitamentos seguidos.
+    """
+
+    def __init__(self, reader, scale=4, box_margin=8, pixel_threshold=20,
+                 min_changed_pixels=4, max_reuse=30, max_layouts=8):
+        self.reader = reader
+        self.scale = scale                    # Redução da assinatura usada na verificação
+        self.box_margin = box_margin          # Folga (px) ao redor das caixas detectadas
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_pixels = min_changed_pixels
+        self.max_reuse = max_reuse
+        self.max_layouts = max_layouts
+        self._layouts = OrderedDict()  # formato -> dados do layout detectado
+
+        # Contadores
+        self.detections_run = 0
+        self.detections_reused = 0
+
+    def reset(self):
+        """Descarta os layouts memorizados (força nova detecção)."""
+        self._layouts.clear()
+
+    def readtext(self, image, **kwargs):
+        """Mesmo formato de retorno de easyocr.Reader.readtext."""
+        detect_kwargs = {k: v for k, v in kwargs.items() if k in DETECT_PARAMS}
+        recognize_kwargs = {k: v for k, v in kwargs.items() if k not in DETECT_PARAMS}
+
+        signature = self._signature(image)
+        key = (image.shape, repr(sorted(detect_kwargs.items())))
+        layout = self._layouts.get(key)
+
+        if layout is not None and self._layout_is_stable(layout, signature):
+            layout['reuse_count'] += 1
+            self.detections_reused += 1
+            self._layouts.move_to_end(key)
+        else:
+            layout = self._detect(image, signature, detect_kwargs)
+            self._layouts[key] = layout
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+
+        if not layout['horizontal'] and not layout['free']:
+            return []
+
+        return self.reader.recognize(
+            image, horizontal_list=layout['horizontal'], free_list=layout['free'],
+            **recognize_kwargs)
+
+    def _detect(self, image, signature, detect_kwargs):
+        """Roda a detecção e monta a máscara das caixas para as próximas verificações."""
+        self.detections_run += 1
+        horizontal_list, free_list = self.reader.detect(image, **detect_kwargs)
+        horizontal = horizontal_list[0] if horizontal_list else []
+        free = free_list[0] if free_list else []
+
+        # Máscara (na resolução da assinatura) das áreas ocupadas por texto
+        mask = np.zeros(signature.shape, dtype=bool)
+        m = self.box_margin
+        boxes = [(x_min, x_max, y_min, y_max) for x_min, x_max, y_min, y_max in horizontal]
+        for poly in free:
+            xs = [pt[0] for pt in poly]
+            ys = [pt[1] for pt in poly]
+            boxes.append((min(xs), max(xs), min(ys), max(ys)))
+        for x_min, x_max, y_min, y_max in boxes:
+            mask[max(0, int(y_min - m) // self.scale):int(y_max + m) // self.scale + 1,
+                 max(0, int(x_min - m) // self.scale):int(x_max + m) // self.scale + 1] = True
+
+        return {
+            'horizontal': horizontal,
+            'free': free,
+            'signature': signature,
+            'mask': mask,
+            'reuse_count': 0,
+        }
+
+    def _layout_is_stable(self, layout, signature):
+        """Verifica se nada mudou fora das caixas desde a última detecção."""
+        if layout['reuse_count'] >= self.max_reuse:
+            return False
+        changed = np.abs(signature - layout['signature']) > self.pixel_threshold
+        changed &= ~layout['mask']
+        return np.count_nonzero(changed) < self.min_changed_pixels
+
+    def _signature(self, image):
+        """Versão reduzida em escala de cinza da imagem, para comparações baratas."""
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        h, w = gray.shape
+        size = (max(1, w // self.scale), max(1, h // self.scale))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.int16)
@@ -0,0 +1,66 @@
+import numpy as np
+
+from frame_diff import FrameDiffer, group_tiles, grow_areas
+
+
+def test_group_tiles():
+    mask = np.zeros((4, 6), dtype=bool)
+    mask[0, 0] = mask[1, 1] = True  # Vizinhos na diagonal: um grupo
+    mask[3, 4:6] = True
+    assert sorted(group_tiles(mask)) == [(0, 0, 1, 1), (3, 4, 3, 5)]
+    assert group_tiles(np.zeros((2, 2), dtype=bool)) == []
+
+
+def test_first_frame_is_all_changed():
+    differ = FrameDiffer(tile_size=64, scale=8)
+    frame = np.zeros((128, 256, 3), dtype=np.uint8)
+    assert differ.changed_tiles(frame).all()
+    assert differ.changed_areas(frame) == [(0, 0, 256, 128)]
+
+
+def test_unchanged_frame_has_no_areas():
+    differ = FrameDiffer(tile_size=64, scale=8)
+    frame = np.zeros((128, 256, 3), dtype=np.uint8)
+    differ.commit(frame)
+    assert not differ.changed_tiles(frame.copy()).any()
+    assert differ.changed_areas(frame.copy()) == []
+
+
+def test_only_changed_tile_is_reported():
+    differ = FrameDiffer(tile_size=64, scale=8)
+    frame = np.zeros((128, 256, 3), dtype=np.uint8)
+    differ.commit(frame)
+    changed = frame.copy()
+    changed[70:100, 140:180] = 255
+    tiles = differ.changed_tiles(changed)
+    assert tiles.shape == (2, 4)
+    assert np.argwhere(tiles).tolist() == [[1, 2]]
+    assert differ.changed_areas(changed, margin=4) == [(124, 60, 196, 128)]
+
+
+def test_small_noise_is_ignored():
+    differ = FrameDiffer(tile_size=64, scale=8)
+    frame = np.full((128, 256, 3), 100, dtype=np.uint8)
+    differ.commit(frame)
+    assert not differ.changed_tiles(frame + 5).any()
+
+
+def test_reset_and_resize_mark_everything():
+    differ = FrameDiffer(tile_size=64, scale=8)
+    frame = np.zeros((128, 256, 3), dtype=np.uint8)
+    differ.commit(frame)
+    assert differ.changed_tiles(np.zeros((64, 64, 3), dtype=np.uint8)).all()
+    differ.reset()
+    assert differ.changed_tiles(frame).all()
+
+
+def test_grow_areas_covers_touched_boxes_and_merges():
+    # Duas áreas em cantos opostos de um mesmo texto grande viram uma só
+    areas = grow_areas([(0, 0, 50, 50), (150, 150, 200, 200)], [(20, 20, 180, 180)], 200, 200)
+    assert areas == [(0, 0, 200, 200)]
+
+    # Áreas que tocam textos separados crescem sem se unir
+    areas = grow_areas([(0, 0, 30, 30), (150, 0, 170, 30)],
+                       [(10, 10, 60, 20), (140, 10, 190, 20)], 200, 200, margin=2)
+    assert areas == [(0, 0, 62, 30), (138, 0, 192, 30)]
+    assert grow_areas([(0, 0, 10, 10)], [], 100, 100) == [(0, 0, 10, 10)]
@@ -0,0 +1,67 @@
+import cv2
+import numpy as np
+
+from incremental_ocr import IncrementalOCR
+from ocr_backends import OCRResult
+
+
+class BoxBackend:
+    """Motor falso: um texto cobrindo cada componente claro da imagem."""
+
+    def __init__(self):
+        self.calls = []
+
+    def readtext(self, image):
+        self.calls.append(image.shape[:2])
+        count, _, stats, _ = cv2.connectedComponentsWithStats(
+            (image[:, :, 0] > 0).astype(np.uint8))
+        return [OCRResult([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], f'{w}x{h}', 0.9)
+                for x, y, w, h, _ in stats[1:].tolist()]
+
+
+def frame():
+    image = np.zeros((512, 512, 3), dtype=np.uint8)
+    image[20:490, 20:490] = 100  # Um texto grande cobrindo quase o quadro todo
+    return image
+
+
+def test_unchanged_frame_reuses_results():
+    backend = BoxBackend()
+    ocr = IncrementalOCR(backend)
+    first = ocr.readtext(frame(), key='area')
+    assert ocr.readtext(frame(), key='area') == first
+    assert len(backend.calls) == 1
+
+
+def test_edits_in_two_corners_of_one_text_recognize_it_once():
+    # Regressão: a segunda área alterada reconhecia de novo um fragmento do
+    # mesmo texto, já coberto pela primeira área crescida
+    backend = BoxBackend()
+    ocr = IncrementalOCR(backend)
+    ocr.readtext(frame(), key='area')
+
+    edited = frame()
+    edited[30:40, 30:40] = 200
+    edited[470:480, 470:480] = 200
+    results = ocr.readtext(edited, key='area')
+    assert len(results) == 1
+    assert results[0].box[0] == [20, 20] and results[0].box[2] == [490, 490]
+    assert len(backend.calls) == 2
+
+
+def test_separate_texts_keep_unchanged_results():
+    backend = BoxBackend()
+    ocr = IncrementalOCR(backend)
+    image = np.zeros((512, 512, 3), dtype=np.uint8)
+    image[10:40, 10:100] = 100
+    image[400:430, 300:500] = 100
+    ocr.readtext(image, key='area')
+    first = backend.calls[:]
+
+    # Só o texto de cima muda: o de baixo é reaproveitado
+    image = image.copy()
+    image[10:40, 10:120] = 150
+    results = ocr.readtext(image, key='area')
+    assert [r.text for r in results] == ['110x30', '200x30']
+    assert len(backend.calls) == len(first) + 1
+    assert backend.calls[-1][0] < 512
@@ -0,0 +1,97 @@
+import numpy as np
+
+from multilang_ocr import MultiLanguageReader, ReaderCache, detect_language, language_groups
+from ocr_backends import OCRResult, merge_lines
+
+BOX = [[10, 10], [60, 10], [60, 30], [10, 30]]
+
+
+class FakeReader:
+    """Leitor falso: devolve o mesmo resultado para qualquer imagem."""
+
+    def __init__(self, text, confidence):
+        self.text = text
+        self.confidence = confidence
+        self.calls = 0
+
+    def readtext(self, image):
+        self.calls += 1
+        return [OCRResult(BOX, self.text, self.confidence)]
+
+
+def make_reader(readers):
+    loads = []
+
+    def factory(group):
+        loads.append(group)
+        return readers[group]
+
+    cache = ReaderCache(factory, max_readers=3)
+    return MultiLanguageReader(cache, list(readers)), loads
+
+
+def test_language_groups():
+    assert language_groups(['ja', 'ko', 'en']) == [('ja', 'en'), ('ko', 'en')]
+    assert language_groups(['en', 'pt']) == [('en', 'pt')]
+
+
+def test_detect_language():
+    candidates = ['ja', 'ko', 'en']
+    assert detect_language('안녕하세요', candidates) == 'ko'
+    assert detect_language('こんにちは', candidates) == 'ja'
+    assert detect_language('Hello', candidates) == 'en'
+
+
+def test_korean_read_by_japanese_reader_is_rerecognized():
+    # O leitor ja+en não produz hangul: lê kanji/kana "lixo" com confiança baixa
+    readers = {('ja', 'en'): FakeReader('安寧', 0.2), ('ko', 'en'): FakeReader('안녕', 0.9)}
+    reader, loads = make_reader(readers)
+    image = np.zeros((40, 80, 3), dtype=np.uint8)
+
+    results = reader.readtext(image)
+    assert [result.text for result in results] == ['안녕']
+    assert ('ko', 'en') in loads
+
+    # O leitor coreano venceu: passa a ser o principal, sem leitura dupla
+    readers[('ja', 'en')].calls = 0
+    assert [result.text for result in reader.readtext(image)] == ['안녕']
+    assert readers[('ja', 'en')].calls == 0
+
+
+def test_confident_primary_result_is_kept():
+    readers = {('ja', 'en'): FakeReader('こんにちは', 0.95), ('ko', 'en'): FakeReader('안녕', 0.9)}
+    reader, loads = make_reader(readers)
+    results = reader.readtext(np.zeros((40, 80, 3), dtype=np.uint8))
+    assert [result.text for result in results] == ['こんにちは']
+    assert loads == [('ja', 'en')]
+
+
+def test_reader_cache_keeps_groups_in_use():
+    cache = ReaderCache(lambda group: object(), max_readers=1)
+    cache.get(('ja', 'en'))
+    cache.get(('ko', 'en'), keep=[('ja', 'en')])
+    assert cache.loaded() == [('ja', 'en'), ('ko', 'en')]
+    cache.get(('th', 'en'))
+    assert cache.loaded() == [('th', 'en')]
+
+
+def test_merge_lines_keeps_confidence():
+    lines = [
+        OCRResult([[10, 10], [100, 10], [100, 30], [10, 30]], 'Hello', 0.9),
+        OCRResult([[10, 34], [80, 34], [80, 54], [10, 54]], 'world', 0.5),
+        OCRResult([[300, 200], [380, 200], [380, 220], [300, 220]], 'Far', 0.7),
+    ]
+    merged = merge_lines(lines)
+    assert [result.text for result in merged] == ['Hello world', 'Far']
+    assert merged[0].box == [[10, 10], [100, 10], [100, 54], [10, 54]]
+    assert abs(merged[0].confidence - 0.7) < 1e-9
+    assert abs(merged[1].confidence - 0.7) < 1e-9
+
+
+def test_merge_lines_reading_order():
+    lines = [
+        OCRResult([[60, 10], [100, 10], [100, 30], [60, 30]], 'B', 1.0),
+        OCRResult([[10, 12], [50, 12], [50, 30], [10, 30]], 'A', 1.0),
+        OCRResult([[10, 36], [50, 36], [50, 56], [10, 56]], 'C', 1.0),
+    ]
+    assert merge_lines(lines)[0].text == 'A B C'
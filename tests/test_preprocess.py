@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from preprocess import Preprocessor
+
+
+class RecordingBackend:
+    """Motor falso: guarda o tamanho de cada recorte recebido."""
+
+    def __init__(self):
+        self.crops = []
+
+    def readtext(self, image):
+        self.crops.append(image.shape[:2])
+        return []
+
+
+def test_blank_image_falls_back_to_whole_image():
+    backend = RecordingBackend()
+    Preprocessor(backend).readtext(np.full((200, 300, 3), 90, dtype=np.uint8))
+    assert backend.crops == [(200, 300)]
+
+
+def test_large_text_is_not_cropped_away():
+    image = np.full((300, 1400, 3), 40, dtype=np.uint8)
+    cv2.putText(image, 'The quick brown fox', (20, 180), cv2.FONT_HERSHEY_SIMPLEX,
+                4, (230, 230, 230), 8)
+    crops, _ = Preprocessor(None)._propose(cv2.cvtColor(image, cv2.COLOR_RGB2GRAY))
+    assert len(crops) == 1
+    x1, y1, x2, y2 = crops[0]
+    # O recorte contém a frase inteira (de x=20 até o fim do texto)
+    text_x = np.nonzero((image[:, :, 0] > 128).any(axis=0))[0]
+    text_y = np.nonzero((image[:, :, 0] > 128).any(axis=1))[0]
+    assert x1 <= text_x[0] and x2 > text_x[-1]
+    assert y1 <= text_y[0] and y2 > text_y[-1]
+
+
+def test_boxes_map_back_to_image_coordinates():
+    class FixedBackend:
+        def readtext(self, image):
+            h, w = image.shape[:2]
+            return [([[0, 0], [w, 0], [w, h], [0, h]], 'text', 0.9)]
+
+    image = np.full((200, 400, 3), 255, dtype=np.uint8)
+    cv2.putText(image, 'Hello', (150, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    results = Preprocessor(FixedBackend()).readtext(image)
+    assert len(results) == 1
+    xs = [pt[0] for pt in results[0].box]
+    ys = [pt[1] for pt in results[0].box]
+    assert min(xs) <= 150 and max(xs) >= 230
+    assert min(ys) <= 100 and max(ys) >= 120
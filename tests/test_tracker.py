@@ -0,0 +1,56 @@
+from tracker import RegionTracker, box_iou, text_similarity
+
+
+def region(bbox, text):
+    return {'bbox': bbox, 'orig_text': text, 'translation': f'[pt] {text}'}
+
+
+def test_box_iou():
+    assert box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert box_iou((0, 0, 10, 10), (20, 20, 10, 10)) == 0.0
+    assert abs(box_iou((0, 0, 10, 10), (5, 0, 10, 10)) - 50 / 150) < 1e-9
+
+
+def test_text_similarity():
+    assert text_similarity('abc', 'abc') == 1.0
+    assert text_similarity('abc', 'xyz') == 0.0
+    assert text_similarity('continue', 'contlnue') > 0.8
+
+
+def test_same_text_same_place_is_still_and_equal():
+    previous = [region((10, 10, 100, 20), 'Press Start')]
+    matches = RegionTracker().match(previous, [(11, 10, 100, 20, 'press  start')])
+    assert matches == [(previous[0], True, True)]
+
+
+def test_ocr_jitter_matches_but_is_not_equal():
+    previous = [region((10, 10, 100, 20), 'Continue the quest')]
+    matches = RegionTracker().match(previous, [(10, 10, 100, 20, 'Contlnue the quest')])
+    assert matches == [(previous[0], True, False)]
+
+
+def test_moved_text_is_not_still():
+    previous = [region((10, 10, 100, 20), 'Press Start')]
+    matches = RegionTracker().match(previous, [(20, 12, 100, 20, 'Press Start')])
+    assert matches == [(previous[0], False, True)]
+
+
+def test_changed_numbers_are_new_text():
+    # Regressão: contadores que mudam não podem manter o texto antigo
+    previous = [region((10, 10, 100, 20), 'Gold: 1250'), region((10, 40, 60, 20), 'Day 2')]
+    matches = RegionTracker().match(
+        previous, [(10, 10, 100, 20, 'Gold: 1260'), (10, 40, 60, 20, 'Day 3')])
+    assert matches == [None, None]
+
+
+def test_each_previous_region_matches_once():
+    previous = [region((10, 10, 100, 20), 'Press Start')]
+    matches = RegionTracker().match(
+        previous, [(10, 10, 100, 20, 'Press Start'), (12, 10, 100, 20, 'Press Start')])
+    assert matches[0] == (previous[0], True, True)
+    assert matches[1] is None
+
+
+def test_no_previous():
+    assert RegionTracker().match([], [(0, 0, 1, 1, 'a')]) == [None]
+    assert RegionTracker().match(None, [(0, 0, 1, 1, 'a')]) == [None]
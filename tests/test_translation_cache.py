@@ -0,0 +1,59 @@
+from translation import TranslationCache, normalize_text
+
+
+def test_normalize_text():
+    assert normalize_text('  Press\n  Start ') == 'Press Start'
+    assert normalize_text('Café') == 'Café'
+
+
+def test_memory_hit_and_miss():
+    cache = TranslationCache(path=None)
+    assert cache.get('en', 'pt', 'Hello') is None
+    cache.put('en', 'pt', 'Hello', 'Olá')
+    assert cache.get('en', 'pt', ' Hello ') == 'Olá'
+    assert cache.get('en', 'es', 'Hello') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_memory_lru_eviction():
+    cache = TranslationCache(path=None, max_memory_entries=2)
+    cache.put('en', 'pt', 'a', 'A')
+    cache.put('en', 'pt', 'b', 'B')
+    cache.get('en', 'pt', 'a')  # 'a' passa a ser o mais recente
+    cache.put('en', 'pt', 'c', 'C')
+    assert cache.get('en', 'pt', 'b') is None
+    assert cache.get('en', 'pt', 'a') == 'A'
+    assert cache.stats()['memory_entries'] == 2
+
+
+def test_disk_tier_survives_reopen(tmp_path):
+    path = str(tmp_path / 'translations.db')
+    cache = TranslationCache(path=path)
+    cache.put('en', 'pt', 'Hello', 'Olá')
+    cache.close()
+
+    cache = TranslationCache(path=path)
+    assert cache.stats()['disk_entries'] == 1
+    assert cache.get('en', 'pt', 'Hello') == 'Olá'
+    assert cache.disk_hits == 1
+    cache.close()
+
+
+def test_disk_eviction_keeps_limit(tmp_path):
+    cache = TranslationCache(path=str(tmp_path / 'translations.db'), max_memory_entries=1,
+                             max_disk_entries=10)
+    for i in range(30):
+        cache.put('en', 'pt', f'text {i}', f'texto {i}')
+    assert cache.stats()['disk_entries'] <= 10
+    assert cache.get('en', 'pt', 'text 29') == 'texto 29'
+    cache.close()
+
+
+def test_clear(tmp_path):
+    cache = TranslationCache(path=str(tmp_path / 'translations.db'))
+    cache.put('en', 'pt', 'Hello', 'Olá')
+    cache.clear()
+    assert cache.get('en', 'pt', 'Hello') is None
+    assert cache.stats()['disk_entries'] == 0
+    cache.close()
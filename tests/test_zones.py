@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+
+from metrics import Metrics
+from zones import WatchZone, ZoneScheduler, load_zones, save_zones
+
+
+class FakeEngine:
+    """Motor falso: cada chamada de translate_frame retorna as regiões em `next`."""
+
+    def __init__(self):
+        self.metrics = Metrics(path=None)
+        self.next = []
+        self.calls = []
+
+    def wait_until_ready(self, timeout=None):
+        return True
+
+    def grab(self, bbox):
+        x1, y1, x2, y2 = bbox
+        return np.zeros((y2 - y1, x2 - x1, 3), dtype=np.uint8)
+
+    def translate_frame(self, frame, bbox, ocr_key=None, metrics=None, previous=None,
+                        languages=None):
+        self.calls.append(list(previous))
+        return list(self.next)
+
+
+def region(bbox, text):
+    return {'bbox': bbox, 'orig_text': text, 'translation': text}
+
+
+def test_save_and_load_zones(tmp_path):
+    path = str(tmp_path / 'zones.json')
+    save_zones([WatchZone('chat', (0, 0, 100, 50), interval=1, languages=['ja'], priority=2)], path)
+    zone, = load_zones(path)
+    assert (zone.name, zone.bbox, zone.interval, zone.languages, zone.priority) == \
+        ('chat', (0, 0, 100, 50), 1.0, ['ja'], 2)
+    assert load_zones(str(tmp_path / 'missing.json')) == []
+
+
+def test_seeded_regions_are_removed_by_first_result():
+    # Regressão: ao religar as zonas, as regiões da vigilância anterior ficavam na tela
+    engine = FakeEngine()
+    old = region((10, 10, 20, 10), 'old')
+    new = region((10, 30, 20, 10), 'new')
+    engine.next = [new]
+    done = threading.Event()
+    results = []
+
+    def on_result(zone, regions, removed, metrics, token):
+        results.append((regions, removed))
+        done.set()
+
+    zone = WatchZone('subs', (0, 0, 64, 64), interval=0.05)
+    scheduler = ZoneScheduler(engine, [zone], on_result,
+                              seed=lambda zones: {'subs': [old]})
+    scheduler.start()
+    try:
+        assert done.wait(5)
+    finally:
+        scheduler.stop()
+        scheduler.join(5)
+    assert engine.calls[0] == [old]
+    assert results[0] == ([new], [old])
+
+
+def test_new_scheduler_waits_for_the_previous_thread():
+    engine = FakeEngine()
+    zone = WatchZone('subs', (0, 0, 64, 64), interval=0.05)
+    first = ZoneScheduler(engine, [zone], lambda *args: None)
+    first.start()
+    first.stop()
+    second = ZoneScheduler(engine, [zone], lambda *args: None)
+    second.start(after=first)
+    second.stop()
+    second.join(5)
+    assert not first._thread.is_alive()
@@ -0,0 +1,90 @@
+import re
+from difflib import SequenceMatcher
+
+from translation import normalize_text
+
+# Sequências de dígitos: textos que diferem nelas (ex.: "Gold: 1250" e
+# "Gold: 1260") são textos diferentes, não variação do OCR
+_DIGITS = re.compile(r'\d+')
+
+
+def box_iou(a, b):
+    """Interseção sobre união de duas caixas (x, y, w, h)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = min(ax + aw, bx + bw) - max(ax, bx)
+    ih = min(ay + ah, by + bh) - max(ay, by)
+    if iw <= 0 or ih <= 0:
+        return 0.0
+    inter = iw * ih
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+def text_similarity(a, b):
+    """Semelhança (0 a 1) entre dois textos, tolerante a um caractere trocado do OCR."""
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    # quick_ratio é um limite superior barato: evita o cálculo completo
+    if matcher.quick_ratio() == 0.0:
+        return 0.0
+    return matcher.ratio()
+
+
+class RegionTracker:
+    """
+    Associa as caixas de um novo OCR às regiões do scan anterior, pela
+    sobreposição (IoU) e pela semelhança do texto. Uma caixa associada é
+    considerada o mesmo texto: a tradução anterior é reaproveitada, sem
+    chamar o tradutor, e pequenas variações do OCR (um caractere, caixa
+    deslocada alguns pixels) não causam tradução. Textos com números
+    diferentes nunca são associados (um contador que mudou é texto novo).
+    """
+
+    def __init__(self, min_iou=0.5, min_similarity=0.8, still_tolerance=3):
+        self.min_iou = min_iou
+        self.min_similarity = min_similarity
+        self.still_tolerance = still_tolerance  # Pixels de variação tolerados na caixa
+
+    def match(self, previous, candidates):
+        """
+        previous: regiões do scan anterior (dicionários com 'bbox' e
+        'orig_text'); candidates: lista de (x, y, w, h, texto) do novo OCR,
+        nas mesmas coordenadas.
+
+        Retorna, para cada candidato, None (texto novo) ou (região anterior,
+        parada, igual), onde parada indica que a caixa não se moveu além da
+        tolerância e igual que o texto normalizado é o mesmo (não só
+        parecido). Cada região anterior é associada a no máximo um candidato.
+        """
+        if not previous or not candidates:
+            return [None] * len(candidates)
+
+        previous_texts = [normalize_text(region['orig_text']).casefold() for region in previous]
+        previous_digits = [_DIGITS.findall(text) for text in previous_texts]
+        keys = []
+        pairs = []
+        for i, (x, y, w, h, text) in enumerate(candidates):
+            key = normalize_text(text).casefold()
+            keys.append(key)
+            digits = _DIGITS.findall(key)
+            for j, region in enumerate(previous):
+                overlap = box_iou((x, y, w, h), region['bbox'])
+                if overlap < self.min_iou or digits != previous_digits[j]:
+                    continue
+                similarity = text_similarity(key, previous_texts[j])
+                if similarity >= self.min_similarity:
+                    pairs.append((overlap + similarity, i, j))
+
+        # Associação gulosa, dos pares mais parecidos para os menos
+        pairs.sort(reverse=True)
+        matches = [None] * len(candidates)
+        used = set()
+        for _, i, j in pairs:
+            if matches[i] is not None or j in used:
+                continue
+            used.add(j)
+            still = max(abs(a - b) for a, b in zip(candidates[i][:4], previous[j]['bbox'])) \
+                <= self.still_tolerance
+            matches[i] = (previous[j], still, keys[i] == previous_texts[j])
+        return matches
@@ -0,0 +1,454 @@
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from config import DATA_DIR
+
+DEFAULT_CACHE_PATH = os.path.join(DATA_DIR, 'translations.db')
+
+
+def normalize_text(text):
+    """Normaliza o texto para uso como chave de cache (unicode e espaços)."""
+    text = unicodedata.normalize('NFC', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class TranslationCache:
+    """
+    Cache de traduções em duas camadas: LRU em memória e SQLite em disco.
+    As chaves são (idioma de origem, idioma de destino, texto normalizado).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_memory_entries=2048, max_disk_entries=100000):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Contadores de desempenho
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Camada em disco (opcional: path=None mantém apenas a memória)
+        self._db = None
+        self._disk_entries = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                " translation TEXT NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (source, target, text))")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+            self._db.commit()
+            self._disk_entries = self._db.execute(
+                "SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get(self, source, target, text):
+        """Retorna a tradução armazenada ou None se não estiver no cache."""
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT translation FROM translations"
+                    " WHERE source = ? AND target = ? AND text = ?", key).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE translations SET last_used = ?"
+                        " WHERE source = ? AND target = ? AND text = ?",
+                        (time.time(),) + key)
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, source, target, text, translation):
+        """Armazena uma tradução nas duas camadas."""
+        key = (source, target, normalize_text(text))
+        with self._lock:
+            self._remember(key, translation)
+
+            if self._db is not None:
+                exists = self._db.execute(
+                    "SELECT 1 FROM translations"
+                    " WHERE source = ? AND target = ? AND text = ?", key).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations"
+                    " (source, target, text, translation, last_used)"
+                    " VALUES (?, ?, ?, ?, ?)", key + (translation, time.time()))
+                if exists is None:
+                    self._disk_entries += 1
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key, translation):
+        """Insere na camada LRU em memória, descartando as entradas mais antigas."""
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Remove do disco as entradas usadas há mais tempo quando passa do limite."""
+        excess = self._disk_entries - self.max_disk_entries
+        if excess <= 0:
+            return
+        # Remove um pouco a mais para não executar o DELETE a cada inserção
+        excess += self.max_disk_entries // 10
+        self._db.execute(
+            "DELETE FROM translations WHERE rowid IN ("
+            " SELECT rowid FROM translations ORDER BY last_used LIMIT ?)", (excess,))
+        self._disk_entries = max(0, self._disk_entries - excess)
+
+    def stats(self):
+        """Retorna os contadores de acertos/falhas e o tamanho de cada camada."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'memory_entries': len(self._memory),
+                'disk_entries': self._disk_entries,
+            }
+
+    def clear(self):
+        """Apaga todas as traduções armazenadas."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def close(self):
+        """Fecha a conexão com o banco em disco."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class StubTranslator:
+    """Tradutor local determinístico, sem rede (útil para testes)."""
+
+    name = 'stub'
+    batch_native = True  # Traduz o lote inteiro em uma chamada
+
+    def __init__(self, source='en', target='pt', **options):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        return f"[{self.target}] {text}"
+
+    def translate_batch(self, texts):
+        return [self.translate(text) for text in texts]
+
+
+class _TimeoutRequests:
+    """
+    Substitui o módulo requests dentro do deep-translator: as requisições
+    passam por uma sessão por thread (conexões reaproveitadas; requests.Session
+    não é segura entre threads) com timeout. Sem isso uma requisição travada
+    prende para sempre uma thread do CachedTranslator.
+    """
+
+    def __init__(self, timeout):
+        import requests
+
+        self._requests = requests
+        self._local = threading.local()
+        self.timeout = timeout
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        return session
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self._session().get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self._session().post(url, **kwargs)
+
+    def __getattr__(self, name):
+        # exceptions, codes etc. continuam vindo do requests
+        return getattr(self._requests, name)
+
+
+_request_timeout_lock = threading.Lock()
+
+
+def _install_request_timeout(module, timeout):
+    """
+    Instala (uma vez por processo) o _TimeoutRequests no módulo do
+    deep-translator. Depende de deep-translator >= 1.9, cujo google.py faz
+    `import requests` e chama requests.get(...) sem timeout; em outras versões
+    sem esse atributo nada é alterado. Chamadas seguintes só ajustam o timeout.
+    """
+    with _request_timeout_lock:
+        shim = getattr(module, 'requests', None)
+        if isinstance(shim, _TimeoutRequests):
+            shim.timeout = timeout
+        elif shim is not None:
+            module.requests = _TimeoutRequests(timeout)
+
+
+class GoogleBackend:
+    """
+    GoogleTranslator via deep-translator (uma requisição de rede por texto),
+    com timeout em cada requisição (o deep-translator não define nenhum).
+    """
+
+    name = 'google'
+    batch_native = False  # Lotes usam requisições concorrentes (CachedTranslator)
+
+    def __init__(self, source='en', target='pt', timeout=10.0, **options):
+        from deep_translator import GoogleTranslator
+
+        self.source = source
+        self.target = target
+        self.translator = GoogleTranslator(source=source, target=target)
+        _install_request_timeout(sys.modules[type(self.translator).__module__], timeout)
+
+    def translate(self, text):
+        return self.translator.translate(text)
+
+
+class ArgosBackend:
+    """
+    Argos Translate: modelos OpenNMT offline executados em CPU pelo CTranslate2.
+    O pacote de idiomas (origem -> destino) precisa estar instalado.
+    """
+
+    name = 'argos'
+    batch_native = True  # Inferência local: o lote roda em sequência, sem threads extras
+
+    def __init__(self, source='en', target='pt', **options):
+        import argostranslate.translate
+
+        self.source = source
+        self.target = target
+        languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+        translation = None
+        if source in languages and target in languages:
+            translation = languages[source].get_translation(languages[target])
+        if translation is None:
+            raise RuntimeError(f"Pacote do Argos Translate {source}->{target} não instalado")
+        self._translation = translation
+
+    def translate(self, text):
+        return self._translation.translate(text)
+
+    def translate_batch(self, texts):
+        return [self._translation.translate(text) for text in texts]
+
+
+class MarianBackend:
+    """MarianMT (transformers) offline em CPU, com tradução do lote em uma única inferência."""
+
+    name = 'marian'
+    batch_native = True
+
+    def __init__(self, source='en', target='pt', marian_model=None, **options):
+        import torch
+        from transformers import MarianMTModel, MarianTokenizer
+
+        self.source = source
+        self.target = target
+        self.torch = torch
+        model_name = marian_model or f"Helsinki-NLP/opus-mt-{source}-{target}"
+        self.tokenizer = MarianTokenizer.from_pretrained(model_name)
+        self.model = MarianMTModel.from_pretrained(model_name).eval()
+
+    def translate(self, text):
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts):
+        with self.torch.inference_mode():
+            batch = self.tokenizer(texts, return_tensors='pt', padding=True, truncation=True)
+            output = self.model.generate(**batch)
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)
+
+
+# Tradutores disponíveis, selecionáveis por nome
+TRANSLATORS = {
+    GoogleBackend.name: GoogleBackend,
+    ArgosBackend.name: ArgosBackend,
+    MarianBackend.name: MarianBackend,
+    StubTranslator.name: StubTranslator,
+}
+
+
+def create_translator(name, source='en', target='pt', **options):
+    """Cria o tradutor pelo nome ('google', 'argos', 'marian' ou 'stub')."""
+    if name not in TRANSLATORS:
+        raise ValueError(f"Tradutor desconhecido: {name} "
+                         f"(disponíveis: {', '.join(TRANSLATORS)})")
+    return TRANSLATORS[name](source=source, target=target, **options)
+
+
+class CachedTranslator:
+    """
+    Envolve um tradutor (ver TRANSLATORS) consultando o cache antes da rede.
+
+    Com uma memória de traduções (translation_memory.TranslationMemory), a
+    ordem de consulta é: correção do usuário ou termo do glossário, cache,
+    texto quase igual já traduzido e, só então, o tradutor (com os termos
+    do glossário já substituídos).
+    """
+
+    def __init__(self, translator, cache, max_workers=8, timeout=10.0, retries=2, backoff=0.5,
+                 memory=None):
+        self.translator = translator
+        self.cache = cache
+        self.memory = memory
+        self.source = getattr(translator, 'source', 'auto')
+        self.target = getattr(translator, 'target', 'pt')
+
+        # Parâmetros da tradução em lote (requisições concorrentes)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._executor = None
+
+    def translate(self, text):
+        cached = self._lookup(text)
+        if cached is not None:
+            return cached
+
+        translation = self.translator.translate(self._prepare(text))
+        # Não armazena respostas vazias para não fixar falhas no cache
+        if translation:
+            self._remember(text, translation)
+        return translation
+
+    def _lookup(self, text):
+        """Tradução já conhecida (memória, cache ou texto quase igual) ou None."""
+        if self.memory is not None:
+            remembered = self.memory.get_user(self.source, self.target, text)
+            if remembered is not None:
+                return remembered
+        cached = self.cache.get(self.source, self.target, text)
+        if cached is not None or self.memory is None:
+            return cached
+        return self.memory.similar(self.source, self.target, text)
+
+    def _prepare(self, text):
+        """Texto enviado ao tradutor, com os termos do glossário já traduzidos."""
+        if self.memory is None:
+            return text
+        return self.memory.apply_glossary(self.source, self.target, text)
+
+    def _remember(self, text, translation):
+        self.cache.put(self.source, self.target, text, translation)
+        if self.memory is not None:
+            self.memory.add(self.source, self.target, text, translation)
+
+    def translate_batch(self, texts):
+        """
+        Traduz uma lista de textos de uma vez, mantendo a ordem original.
+        Textos repetidos e já em cache não vão para o tradutor; os demais são
+        enviados em um único lote (tradutores locais) ou em requisições
+        paralelas (tradutores de rede). Posições que falharem retornam None.
+        """
+        results = [None] * len(texts)
+        pending = {}  # texto normalizado -> índices que dependem dele
+        for i, text in enumerate(texts):
+            cached = self._lookup(text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(normalize_text(text), []).append(i)
+
+        if not pending:
+            return results
+
+        if getattr(self.translator, 'batch_native', False):
+            unique = [self._prepare(texts[indices[0]]) for indices in pending.values()]
+            try:
+                translations = self.translator.translate_batch(unique)
+            except Exception as e:
+                print(f"Erro na tradução: {e}")
+                return results
+            for indices, translation in zip(pending.values(), translations):
+                self._store(texts, indices, translation, results)
+            return results
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='translate')
+
+        futures = {}
+        for indices in pending.values():
+            text = self._prepare(texts[indices[0]])
+            futures[self._executor.submit(self._translate_with_retry, text)] = indices
+
+        # Tempo máximo para o lote inteiro: todas as tentativas de uma
+        # requisição (cada uma limitada pelo timeout do tradutor de rede)
+        deadline = self.timeout * (self.retries + 1) + \
+            self.backoff * (2 ** self.retries)
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            indices = futures[future]
+            try:
+                translation = future.result()
+            except Exception as e:
+                print(f"Erro na tradução: {e}")
+                continue
+            self._store(texts, indices, translation, results)
+
+        for future in not_done:
+            future.cancel()
+            print(f"Erro na tradução: tempo esgotado para "
+                  f"'{texts[futures[future][0]][:30]}'")
+
+        return results
+
+    def _store(self, texts, indices, translation, results):
+        """Guarda a tradução no cache e em todas as posições que dependem dela."""
+        if translation:
+            self._remember(texts[indices[0]], translation)
+        for i in indices:
+            results[i] = translation
+
+    def _translate_with_retry(self, text):
+        """Executa uma tradução com novas tentativas e espera exponencial."""
+        for attempt in range(self.retries + 1):
+            try:
+                return self.translator.translate(text)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * (2 ** attempt))
+
+    def close(self):
+        """Encerra as threads de tradução."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
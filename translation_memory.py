@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from config import DATA_DIR
+from translation import normalize_text
+from tracker import _DIGITS, text_similarity
+
+DEFAULT_MEMORY_PATH = os.path.join(DATA_DIR, 'memory.db')
+DEFAULT_GLOSSARY_PATH = os.path.join(DATA_DIR, 'glossary.json')
+
+# MinHash: 32 funções de hash em 8 faixas de 4 (textos com ~80% dos
+# trigramas em comum caem no mesmo balde em pelo menos uma faixa). As
+# assinaturas só existem em memória, então o hash() do Python (que muda a
+# cada execução) serve para os trigramas
+_NUM_HASHES = 32
+_ROWS = 4
+_MASK = (1 << 32) - 1
+_rng = np.random.RandomState(20250410)
+# Hash multiply-shift: (a*h + b) >> 32 em 64 bits (a ímpar), sem divisão
+_HASH_A = _rng.randint(0, 1 << 62, size=_NUM_HASHES, dtype=np.uint64) * 2 + 1
+_HASH_B = _rng.randint(0, 1 << 62, size=_NUM_HASHES, dtype=np.uint64)
+_BAND_MIX = _rng.randint(0, 1 << 62, size=_ROWS, dtype=np.uint64) * 2 + 1
+
+
+def _memory_key(text):
+    return normalize_text(text).casefold()
+
+
+def _minhash_many(keys, chunk=2048):
+    """
+    Assinaturas MinHash dos trigramas de caracteres de vários textos,
+    calculadas em blocos vetorizados (carregar a memória do disco).
+    """
+    signatures = np.empty((len(keys), _NUM_HASHES), dtype=np.uint64)
+    for start in range(0, len(keys), chunk):
+        hashes, offsets = [], []
+        for key in keys[start:start + chunk]:
+            padded = f" {key} "
+            offsets.append(len(hashes))
+            hashes.extend({hash(padded[i:i + 3]) & _MASK for i in range(len(padded) - 2)})
+        # Uma linha por função de hash: a redução por texto fica contígua
+        values = np.array(hashes, dtype=np.uint64) * _HASH_A[:, None]
+        values += _HASH_B[:, None]
+        values >>= np.uint64(32)
+        signatures[start:start + len(offsets)] = np.minimum.reduceat(values, offsets, axis=1).T
+    return signatures
+
+
+def _bands_many(keys):
+    """Chaves dos baldes LSH (uma por faixa) de cada texto."""
+    signatures = _minhash_many(keys).reshape(len(keys), -1, _ROWS)
+    # Cada faixa vira um inteiro (a soma com pesos transborda em 64 bits de propósito)
+    return (signatures * _BAND_MIX).sum(axis=2).tolist()
+
+
+def _bands(key):
+    return _bands_many([key])[0]
+
+
+class _PairIndex:
+    """Índices (exato e aproximado) de um par de idiomas."""
+
+    def __init__(self, max_entries=None):
+        self.exact = {}     # chave normalizada -> [tradução, origem] (ordem de inserção)
+        self.buckets = {}   # balde LSH -> chaves
+        self.max_entries = max_entries
+
+    def add(self, key, translation, origin, bands=None):
+        entry = self.exact.get(key)
+        if entry is not None:
+            # Correções do usuário não são sobrescritas por traduções automáticas
+            if entry[1] == 'user' and origin != 'user':
+                return False
+            entry[0], entry[1] = translation, origin
+            return True
+        self.exact[key] = [translation, origin]
+        if len(key) >= 4:
+            for band in enumerate(bands or _bands(key)):
+                self.buckets.setdefault(band, []).append(key)
+        if self.max_entries and len(self.exact) > self.max_entries:
+            self._evict()
+        return True
+
+    def _evict(self):
+        """Tira do índice em memória a tradução automática mais antiga (o disco a mantém)."""
+        oldest = next((key for key, entry in self.exact.items() if entry[1] != 'user'), None)
+        if oldest is None:
+            return
+        del self.exact[oldest]
+        if len(oldest) >= 4:
+            for band in enumerate(_bands(oldest)):
+                bucket = self.buckets.get(band)
+                if bucket is not None and oldest in bucket:
+                    bucket.remove(oldest)
+                    if not bucket:
+                        del self.buckets[band]
+
+    def load(self, rows):
+        """Insere (chave, tradução, origem) em lote."""
+        rows = list(rows)
+        keys = [key for key, _, _ in rows if len(key) >= 4]
+        bands = dict(zip(keys, _bands_many(keys))) if keys else {}
+        for key, translation, origin in rows:
+            self.add(key, translation, origin, bands.get(key))
+
+
+class TranslationMemory:
+    """
+    Memória de traduções: correções feitas pelo usuário e traduções já
+    obtidas, persistidas em SQLite, com um índice exato (hash do texto
+    normalizado) e um índice aproximado (MinHash/LSH sobre trigramas) que
+    serve textos quase iguais (ex.: um caractere errado do OCR) sem rede.
+
+    O glossário (~/.ghosttext/glossary.json) fixa a tradução de termos:
+
+        {"en-pt": {"Health Potion": "Poção de Vida", "Geralt": "Geralt"}}
+
+    Um termo que é o texto inteiro é traduzido direto; dentro de frases ele
+    é substituído pela tradução fixada antes de ir para o tradutor.
+    """
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH, glossary_path=DEFAULT_GLOSSARY_PATH,
+                 min_similarity=0.9, max_candidates=4, max_entries=200000):
+        self.min_similarity = min_similarity
+        self.max_entries = max_entries  # Entradas por par de idiomas no índice em memória
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self._pairs = {}  # (origem, destino) -> _PairIndex
+
+        # Contadores de desempenho
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.glossary_hits = 0
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory ("
+                " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                " translation TEXT NOT NULL, origin TEXT NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (source, target, text))")
+            self._db.commit()
+
+        self.glossary_path = glossary_path
+        self._glossary = {}  # (origem, destino) -> {termo normalizado: tradução}
+        self._glossary_patterns = {}
+        self.load_glossary()
+
+    def _index(self, source, target):
+        """Índice do par de idiomas, carregado do disco na primeira consulta."""
+        pair = (source, target)
+        index = self._pairs.get(pair)
+        if index is None:
+            index = _PairIndex(self.max_entries)
+            if self._db is not None:
+                # As mais recentes, em ordem de atualização (as antigas saem primeiro)
+                index.load(self._db.execute(
+                    "SELECT text, translation, origin FROM ("
+                    " SELECT text, translation, origin, updated FROM memory"
+                    " WHERE source = ? AND target = ? ORDER BY updated DESC LIMIT ?)"
+                    " ORDER BY updated", pair + (self.max_entries or -1,)))
+            self._pairs[pair] = index
+        return index
+
+    def preload(self, source, target):
+        """Carrega do disco o índice do par (evita a espera no primeiro scan)."""
+        with self._lock:
+            self._index(source, target)
+
+    def get(self, source, target, text):
+        """Tradução exata (glossário ou memória) ou None."""
+        key = _memory_key(text)
+        with self._lock:
+            pinned = self._glossary.get((source, target), {}).get(key)
+            if pinned is not None:
+                self.glossary_hits += 1
+                return pinned
+            entry = self._index(source, target).exact.get(key)
+            if entry is not None:
+                self.exact_hits += 1
+                return entry[0]
+        return None
+
+    def get_user(self, source, target, text):
+        """Tradução corrigida pelo usuário (tem prioridade sobre o cache) ou None."""
+        key = _memory_key(text)
+        with self._lock:
+            pinned = self._glossary.get((source, target), {}).get(key)
+            if pinned is not None:
+                self.glossary_hits += 1
+                return pinned
+            entry = self._index(source, target).exact.get(key)
+            if entry is not None and entry[1] == 'user':
+                self.exact_hits += 1
+                return entry[0]
+        return None
+
+    def similar(self, source, target, text):
+        """
+        Tradução de um texto quase igual já visto, ou None. Textos com
+        números diferentes nunca são considerados iguais.
+        """
+        key = _memory_key(text)
+        if len(key) < 4:
+            return None
+        bands = _bands(key)
+        with self._lock:
+            index = self._index(source, target)
+            votes = {}
+            for band in enumerate(bands):
+                for candidate in index.buckets.get(band, ()):
+                    votes[candidate] = votes.get(candidate, 0) + 1
+            if not votes:
+                return None
+
+            digits = _DIGITS.findall(key)
+            best, best_score = None, self.min_similarity
+            # Verifica só os candidatos que mais coincidiram nas faixas
+            for candidate in sorted(votes, key=votes.get, reverse=True)[:self.max_candidates]:
+                if _DIGITS.findall(candidate) != digits:
+                    continue
+                score = text_similarity(key, candidate)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            if best is None:
+                return None
+            self.fuzzy_hits += 1
+            return index.exact[best][0]
+
+    def add(self, source, target, text, translation, origin='mt'):
+        """Registra uma tradução ('mt' = automática, 'user' = corrigida pelo usuário)."""
+        if not translation:
+            return
+        key = _memory_key(text)
+        with self._lock:
+            if not self._index(source, target).add(key, translation, origin):
+                return
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, target, key, translation, origin, time.time()))
+                self._db.commit()
+
+    def load_glossary(self):
+        """(Re)carrega o glossário do arquivo JSON, se existir."""
+        glossary = {}
+        if self.glossary_path and os.path.exists(self.glossary_path):
+            try:
+                with open(self.glossary_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                for pair, terms in data.items():
+                    source, target = pair.split('-', 1)
+                    glossary[(source, target)] = {
+                        _memory_key(term): translation for term, translation in terms.items()}
+            except (OSError, ValueError) as e:
+                print(f"Aviso: glossário inválido em {self.glossary_path}: {e}")
+
+        patterns = {}
+        for pair, terms in glossary.items():
+            if terms:
+                # Termos mais longos primeiro ("Health Potion" antes de "Potion")
+                alternatives = sorted(terms, key=len, reverse=True)
+                patterns[pair] = re.compile(
+                    r'(?<!\w)(' + '|'.join(re.escape(term) for term in alternatives) + r')(?!\w)',
+                    re.IGNORECASE)
+        with self._lock:
+            self._glossary = glossary
+            self._glossary_patterns = patterns
+
+    def apply_glossary(self, source, target, text):
+        """Substitui os termos do glossário pela tradução fixada (antes do tradutor)."""
+        pattern = self._glossary_patterns.get((source, target))
+        if pattern is None:
+            return text
+        terms = self._glossary[(source, target)]
+        return pattern.sub(lambda m: terms[_memory_key(m.group(0))], text)
+
+    def stats(self):
+        with self._lock:
+            entries = sum(len(index.exact) for index in self._pairs.values())
+        return {'entries': entries, 'exact_hits': self.exact_hits,
+                'fuzzy_hits': self.fuzzy_hits, 'glossary_hits': self.glossary_hits}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
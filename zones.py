@@ -0,0 +1,203 @@
+import json
+import os
+import threading
+import time
+
+from config import DATA_DIR
+from frame_diff import FrameDiffer
+from metrics import ScanMetrics
+
+ZONES_PATH = os.path.join(DATA_DIR, 'zones.json')
+
+
+class WatchZone:
+    """
+    Área da tela vigiada continuamente (ex.: barra de legendas, log de
+    missões, chat), com intervalo de captura, idiomas do OCR e prioridade
+    próprios. Zonas de prioridade maior passam antes pelo OCR.
+    """
+
+    def __init__(self, name, bbox, interval=0.5, languages=None, priority=0, enabled=True):
+        self.name = name
+        self.bbox = tuple(int(v) for v in bbox)  # (x1, y1, x2, y2) na tela
+        self.interval = float(interval)          # Segundos entre capturas
+        self.languages = list(languages) if languages else None  # None: ocr_languages da configuração
+        self.priority = int(priority)
+        self.enabled = enabled
+
+    def to_dict(self):
+        return {'name': self.name, 'bbox': list(self.bbox), 'interval': self.interval,
+                'languages': self.languages, 'priority': self.priority, 'enabled': self.enabled}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def load_zones(path=ZONES_PATH):
+    """Carrega as zonas salvas (lista vazia se não houver arquivo)."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [WatchZone.from_dict(data) for data in json.load(f)]
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Aviso: zonas inválidas em {path}: {e}")
+        return []
+
+
+def save_zones(zones, path=ZONES_PATH):
+    """Grava as zonas em JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([zone.to_dict() for zone in zones], f, indent=2, ensure_ascii=False)
+
+
+class ZoneScheduler:
+    """
+    Vigia várias zonas em uma única thread. Cada zona é capturada sozinha no
+    seu intervalo e comparada com o último quadro processado dela; as zonas
+    que mudaram esperam o OCR, que atende sempre a de maior prioridade
+    primeiro (entre uma zona e outra as capturas vencidas são refeitas, então
+    uma zona importante não espera a fila inteira). Uma zona que mudou de
+    novo antes de ser atendida é processada só com o quadro mais recente.
+
+    on_result(zone, regions, removed, metrics, token) recebe o resultado de
+    cada zona processada: as regiões atuais e as do resultado anterior que
+    saíram da tela. begin(zone), se informado, é chamado antes do OCR e o
+    valor retornado volta como token (ex.: a geração da HUD).
+
+    Com settle=True, a captura seguinte ao resultado de uma zona só serve de
+    referência (os overlays recém-desenhados aparecem nela).
+
+    seed(zones), se informado, é chamado ao começar e retorna {nome da zona:
+    regiões já na tela dentro dela} (ex.: de uma vigilância anterior): elas
+    viram o resultado anterior de cada zona, então são reaproveitadas ou
+    removidas no primeiro resultado, em vez de ficarem na tela para sempre.
+    """
+
+    def __init__(self, engine, zones, on_result, begin=None, settle=True, seed=None):
+        self.engine = engine
+        self.zones = [zone for zone in zones if zone.enabled]
+        self.on_result = on_result
+        self.begin = begin
+        self.settle = settle
+        self.seed = seed
+        self.running = False
+        self._thread = None
+        self._after = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Esquece os quadros e resultados anteriores (todas as zonas são refeitas)."""
+        with self._lock:
+            self._differs = {zone.name: FrameDiffer(tile_size=64) for zone in self.zones}
+            self._regions = {zone.name: [] for zone in self.zones}
+            self._settle = set()
+            self._pending = {}  # nome da zona -> quadro alterado esperando o OCR
+            self._next_due = {zone.name: 0.0 for zone in self.zones}
+
+    def start(self, after=None):
+        """
+        Começa a vigiar. after: vigilância anterior (já parada), cuja thread
+        termina antes desta começar, para as duas não rodarem juntas.
+        """
+        self.running = True
+        self._after = after
+        self._thread = threading.Thread(target=self._loop, name='zones', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        """Espera a thread terminar (depois de stop)."""
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _loop(self):
+        if self._after is not None:
+            self._after.join()
+            self._after = None
+        if not self.engine.wait_until_ready():
+            self.running = False
+            return
+        if self.seed is not None and self.running:
+            shown = self.seed(self.zones) or {}
+            with self._lock:
+                for name, regions in shown.items():
+                    if name in self._regions:
+                        self._regions[name] = list(regions)
+        while self.running:
+            try:
+                zone = self._poll()
+                if zone is not None:
+                    with self.engine.metrics.profile():
+                        self._process(zone)
+                    continue
+            except Exception as e:
+                self.engine.metrics.error("nas zonas", e)
+            # Nada esperando o OCR: dorme até a próxima captura vencer
+            with self._lock:
+                wake = min(self._next_due.values(), default=time.monotonic() + 0.5)
+            time.sleep(min(0.5, max(0.0, wake - time.monotonic())))
+
+    def _poll(self):
+        """Captura as zonas vencidas e retorna a alterada de maior prioridade (ou None)."""
+        now = time.monotonic()
+        for zone in self.zones:
+            with self._lock:
+                if self._next_due[zone.name] > now:
+                    continue
+                self._next_due[zone.name] = now + zone.interval
+                differ = self._differs[zone.name]
+            frame = self.engine.grab(zone.bbox)
+            if frame is None:
+                continue
+            with self._lock:
+                if zone.name in self._settle:
+                    # Os overlays desta zona acabaram de ser desenhados
+                    self._settle.discard(zone.name)
+                    differ.commit(frame)
+                    self._pending.pop(zone.name, None)
+                elif differ.changed_tiles(frame).any():
+                    # Cópia: o quadro da captura é reaproveitado
+                    self._pending[zone.name] = frame.copy()
+
+        with self._lock:
+            changed = [zone for zone in self.zones if zone.name in self._pending]
+        if not changed:
+            return None
+        # Maior prioridade primeiro; entre iguais, a que está esperando há mais tempo
+        return max(changed, key=lambda zone: (zone.priority, -self._next_due[zone.name]))
+
+    def _process(self, zone):
+        """OCR e tradução de uma zona alterada."""
+        with self._lock:
+            frame = self._pending.pop(zone.name)
+            previous = self._regions[zone.name]
+            differ = self._differs[zone.name]
+        token = self.begin(zone) if self.begin else None
+
+        metrics = ScanMetrics('zone')
+        metrics.count('zones_waiting', len(self._pending))
+        try:
+            x1, y1 = zone.bbox[:2]
+            regions = self.engine.translate_frame(
+                frame, (x1, y1), ocr_key=('zone', zone.name), metrics=metrics,
+                previous=previous, languages=zone.languages)
+            if regions is None or not self.running:
+                # Substituído, ou a vigilância parou (o resultado não é mais seguido)
+                metrics.count('superseded')
+                return
+            kept = {id(region) for region in regions}
+            removed = [region for region in previous if id(region) not in kept]
+            with self._lock:
+                self._regions[zone.name] = regions
+            self.on_result(zone, regions, removed, metrics, token)
+        finally:
+            differ.commit(frame)
+            if self.settle:
+                with self._lock:
+                    self._settle.add(zone.name)